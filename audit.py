@@ -0,0 +1,347 @@
+import os
+import re
+import time
+import zlib
+from html.parser import HTMLParser
+
+# Budget name -> what it limits, in bytes unless noted
+METRICS = {
+    "html": "page size",
+    "css": "<style> blocks plus linked local stylesheets",
+    "inline_style": "style=\"...\" attributes",
+    "script": "inline <script> blocks",
+    "nodes": "elements in the DOM, not counting <template> contents (count)",
+    "depth": "deepest element nesting (count)",
+    "transfer": "estimated gzip transfer of the page and its stylesheets",
+    "unused_selectors": "CSS selectors matching nothing on the page (count)"
+}
+# Level most servers compress text with on the fly
+TRANSFER_LEVEL = 6
+GZIP_WBITS = 31
+MAX_LISTED = 10
+
+VOID_ELEMENTS = frozenset("area base br col embed hr img input link meta param source track wbr".split())
+GROUPING_RULES = frozenset({"media", "supports", "layer", "container", "document"})
+
+CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+CSS_BRACE = re.compile(r"[{}]")
+# Pseudo-classes with arguments (:not(.a)), then the rest, then [attr] tests
+SELECTOR_NOISE = re.compile(r"::?[\w-]+\([^)]*\)|::?[\w-]+|\[[^\]]*\]")
+SELECTOR_ID = re.compile(r"#([\w-]+)")
+SELECTOR_CLASS = re.compile(r"\.([\w-]+)")
+SELECTOR_TAG = re.compile(r"(?:^|[\s>+~])([a-zA-Z][\w-]*)")
+
+
+def parse_budgets(text):
+    # "html=60000,nodes=1500" -> {"html": 60000, "nodes": 1500}
+    budgets = {}
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        key, sep, value = item.partition("=")
+        key = key.strip().replace("-", "_")
+        if not sep or key not in METRICS:
+            raise ValueError(f"unknown budget '{item}' (expected one of {', '.join(METRICS)} as name=value)")
+        try:
+            budgets[key] = int(float(value))
+        except ValueError:
+            raise ValueError(f"budget {key} must be a number, got '{value}'")
+    return budgets
+
+
+def css_selectors(css):
+    # Selectors of every style rule, including rules inside @media and
+    # @supports; @keyframes and @font-face bodies are not selectors
+    selectors = []
+    # One entry per open block: True when it holds rules, False for declarations
+    blocks = []
+    position = 0
+    for match in CSS_BRACE.finditer(CSS_COMMENT.sub("", css)):
+        if match.group() == "{":
+            prelude = match.string[position:match.start()].rsplit(";", 1)[-1].strip()
+            in_rules = all(blocks)
+            if prelude.startswith("@"):
+                blocks.append(in_rules and prelude[1:].split(None, 1)[0].lower() in GROUPING_RULES)
+            else:
+                if in_rules:
+                    selectors.extend(s.strip() for s in prelude.split(",") if s.strip())
+                blocks.append(False)
+        elif blocks:
+            blocks.pop()
+        position = match.end()
+    return selectors
+
+
+def selector_parts(selector):
+    # (ids, classes, tags) a selector needs; pseudo-classes and attribute
+    # tests are dropped, so a selector counts as used when it might match
+    selector = SELECTOR_NOISE.sub(" ", selector)
+    return (frozenset(SELECTOR_ID.findall(selector)), frozenset(SELECTOR_CLASS.findall(selector)),
+            frozenset(tag.lower() for tag in SELECTOR_TAG.findall(selector)))
+
+
+class Stylesheet:
+    # A parsed stylesheet: its selectors and byte sizes
+    def __init__(self, css):
+        data = css.encode("utf-8")
+        self.size = len(data)
+        self.transfer = len(zlib.compress(data, TRANSFER_LEVEL)) + 18
+        self.selectors = [(selector, selector_parts(selector)) for selector in css_selectors(css)]
+
+
+class PageAuditor(HTMLParser):
+    # Streaming audit of one page: feed() it chunks as they are rendered,
+    # then result(). Nothing of the page is kept beyond its inline CSS and
+    # the sets of tags, classes and ids seen.
+    def __init__(self, base_dir=None, sheets=None):
+        super().__init__(convert_charrefs=False)
+        self.base_dir = base_dir
+        self.sheets = {} if sheets is None else sheets
+        self.compressor = zlib.compressobj(TRANSFER_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+        self.metrics = dict.fromkeys(METRICS, 0)
+        self.compressed = 0
+        self.open = 0
+        # Depth inside <template>s, whose contents are not part of the DOM
+        self.inert = 0
+        self.raw = None
+        self.styles = []
+        self.links = []
+        self.tags = set()
+        self.classes = set()
+        self.ids = set()
+
+    def feed(self, chunk):
+        data = chunk.encode("utf-8")
+        self.metrics["html"] += len(data)
+        self.compressed += len(self.compressor.compress(data))
+        super().feed(chunk)
+
+    def handle_starttag(self, tag, attrs):
+        self._element(tag, attrs)
+        if tag == "template":
+            self.inert += 1
+        elif tag not in VOID_ELEMENTS and not self.inert:
+            self.open += 1
+            if self.open > self.metrics["depth"]:
+                self.metrics["depth"] = self.open
+        if tag in ("style", "script"):
+            self.raw = tag
+
+    def handle_startendtag(self, tag, attrs):
+        self._element(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "template":
+            self.inert = max(0, self.inert - 1)
+        elif tag not in VOID_ELEMENTS and self.open and not self.inert:
+            self.open -= 1
+        self.raw = None
+
+    def handle_data(self, data):
+        if self.raw == "style":
+            self.styles.append(data)
+        elif self.raw == "script":
+            self.metrics["script"] += len(data.encode("utf-8"))
+
+    def _element(self, tag, attrs):
+        metrics = self.metrics
+        if not self.inert:
+            metrics["nodes"] += 1
+        self.tags.add(tag)
+        for name, value in attrs:
+            if not value:
+                continue
+            if name == "class":
+                self.classes.update(value.split())
+            elif name == "id":
+                self.ids.add(value)
+            elif name == "style":
+                metrics["inline_style"] += len(value.encode("utf-8"))
+            elif name == "href" and tag == "link" and ("rel", "stylesheet") in attrs:
+                # A sheet linked twice (e.g. again in <noscript>) loads once
+                if value not in self.links:
+                    self.links.append(value)
+
+    def _linked(self, href):
+        # Local stylesheets are read once per process and shared by pages
+        if self.base_dir is None or "//" in href or href.startswith("data:"):
+            return None
+        path = os.path.normpath(os.path.join(self.base_dir, href.split("?", 1)[0]))
+        if path not in self.sheets:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.sheets[path] = Stylesheet(f.read())
+            except OSError:
+                self.sheets[path] = None
+        return self.sheets[path]
+
+    def result(self):
+        self.close()
+        metrics = self.metrics
+        metrics["transfer"] = self.compressed + len(self.compressor.flush())
+        sheets = [Stylesheet("".join(self.styles))]
+        metrics["css"] = sheets[0].size
+        for href in self.links:
+            sheet = self._linked(href)
+            if sheet is not None:
+                sheets.append(sheet)
+                metrics["css"] += sheet.size
+                metrics["transfer"] += sheet.transfer
+        unused = []
+        for sheet in sheets:
+            for selector, (ids, classes, tags) in sheet.selectors:
+                if not (ids <= self.ids and classes <= self.classes and tags <= self.tags):
+                    unused.append(selector)
+        metrics["unused_selectors"] = len(unused)
+        return {"metrics": metrics, "unused": unused,
+                "selectors": sum(len(sheet.selectors) for sheet in sheets)}
+
+
+def audit_chunks(chunks, base_dir=None, sheets=None):
+    auditor = PageAuditor(base_dir, sheets)
+    for chunk in chunks:
+        auditor.feed(chunk)
+    return auditor.result()
+
+
+def tee(chunks, auditor):
+    # Passes chunks through unchanged, auditing them on the way
+    for chunk in chunks:
+        auditor.feed(chunk)
+        yield chunk
+
+
+def audit_file(path, sheets=None, chunk_size=64 * 1024):
+    with open(path, 'r', encoding='utf-8') as f:
+        return audit_chunks(iter(lambda: f.read(chunk_size), ""), os.path.dirname(path), sheets)
+
+
+def over_budget(metrics, budgets):
+    # [(metric, value, limit)] for every budget the page exceeds
+    return [(key, metrics[key], limit) for key, limit in budgets.items() if metrics[key] > limit]
+
+
+def format_violations(violations):
+    return ", ".join(f"{key} {value} > {limit}" for key, value, limit in violations)
+
+
+class AuditSummary:
+    # Running totals over many pages: every metric's values for percentiles,
+    # unused selectors by how many pages carry them, and pages over budget
+    def __init__(self, budgets=None):
+        self.budgets = budgets or {}
+        self.values = {key: [] for key in METRICS}
+        self.unused = {}
+        self.failures = []
+        self.pages = 0
+
+    def add(self, name, report):
+        self.pages += 1
+        for key, value in report["metrics"].items():
+            self.values[key].append(value)
+        for selector in set(report["unused"]):
+            self.unused[selector] = self.unused.get(selector, 0) + 1
+        violations = over_budget(report["metrics"], self.budgets)
+        if violations:
+            self.failures.append((name, violations))
+        return violations
+
+
+def percentile(ordered, point):
+    # Nearest rank
+    return ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))]
+
+
+def format_summary(summary, elapsed=None, worst=MAX_LISTED):
+    report = f"✓ Audited {summary.pages} pages"
+    if elapsed is not None:
+        report += f" in {elapsed:.2f}s ({summary.pages / elapsed if elapsed else 0:.0f} pages/sec)"
+    if not summary.pages:
+        return report
+    report += f"\n  {'metric':<18}{'median':>10}{'p95':>10}{'max':>10}{'budget':>10}"
+    for key in METRICS:
+        ordered = sorted(summary.values[key])
+        budget = summary.budgets.get(key)
+        report += (f"\n  {key:<18}{percentile(ordered, 50):>10}{percentile(ordered, 95):>10}"
+                   f"{ordered[-1]:>10}{budget if budget is not None else '-':>10}")
+    if summary.unused:
+        report += "\n  Unused selectors (pages):"
+        for selector, count in sorted(summary.unused.items(), key=lambda item: (-item[1], item[0]))[:worst]:
+            report += f"\n    {count:>7}  {selector}"
+    if summary.budgets:
+        report += f"\n  {len(summary.failures)} page(s) over budget"
+        for name, violations in summary.failures[:worst]:
+            report += f"\n✗ {name}: {format_violations(violations)}"
+        if len(summary.failures) > worst:
+            report += f"\n  … and {len(summary.failures) - worst} more"
+    return report
+
+
+# Linked stylesheets already parsed in this process
+_sheets = {}
+
+
+def audit_spec(job):
+    # (name, report or None, error) for one spec, rendered as a stream
+    from batch import normalize_spec
+    from templates import TEMPLATES, iter_template
+    name, template, spec = job
+    if template not in TEMPLATES:
+        return name, None, f"unknown template '{template}'"
+    try:
+        return name, audit_chunks(iter_template(template, normalize_spec(spec))), None
+    except Exception as e:
+        return name, None, str(e)
+
+
+def audit_path(job):
+    name, path = job
+    try:
+        return name, audit_file(path, _sheets), None
+    except (OSError, UnicodeDecodeError) as e:
+        return name, None, str(e)
+
+
+def iter_targets(target):
+    # Jobs for a specs file (.jsonl/.csv), an .html file or a directory of output
+    if os.path.isdir(target):
+        for root, dirs, files in os.walk(target):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith((".html", ".htm")):
+                    path = os.path.join(root, name)
+                    yield audit_path, (os.path.relpath(path, target), path)
+    elif target.lower().endswith((".html", ".htm")):
+        yield audit_path, (target, target)
+    else:
+        from batch import output_name, read_specs
+        used = set()
+        for spec in read_specs(target):
+            yield audit_spec, (output_name(spec, used), spec.get("template", "Business"), spec)
+
+
+def run_job(item):
+    fn, job = item
+    return fn(job)
+
+
+def audit(target, budgets=None, workers=None, chunksize=64):
+    start = time.perf_counter()
+    summary = AuditSummary(budgets)
+    errors = []
+    items = iter_targets(target)
+    if workers == 1:
+        results = map(run_job, items)
+    else:
+        # Imported here so worker processes, which import this module, skip it
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(run_job, items, chunksize=chunksize)
+    try:
+        for name, report, error in results:
+            if error:
+                errors.append((name, error))
+            else:
+                summary.add(name, report)
+    finally:
+        if workers != 1:
+            executor.shutdown()
+    return summary, errors, time.perf_counter() - start
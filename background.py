@@ -0,0 +1,115 @@
+import os
+import queue
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from sync import write_if_changed
+
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+class Job:
+    def __init__(self, runner, channel, on_done, on_error):
+        self.runner = runner
+        self.channel = channel
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise CancelledError()
+
+    def progress(self, text):
+        self.runner.results.put((self, "progress", text))
+
+
+class BackgroundRunner:
+    # Runs work off the Tk thread and hands results back through root.after.
+    # One job is live per channel: submitting again cancels the previous job
+    # and its result is dropped.
+    def __init__(self, root, on_progress=None, max_workers=2, poll_ms=30):
+        self.root = root
+        self.on_progress = on_progress
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="builder")
+        self.results = queue.SimpleQueue()
+        self.active = {}
+        self.polling = False
+
+    def submit(self, channel, work, on_done, on_error=None):
+        previous = self.active.get(channel)
+        if previous is not None:
+            previous.cancel()
+        job = Job(self, channel, on_done, on_error)
+        self.active[channel] = job
+        self.executor.submit(self._run, job, work)
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self, channel):
+        job = self.active.pop(channel, None)
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self):
+        for channel in list(self.active):
+            self.cancel(channel)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, work):
+        try:
+            job.check()
+            self.results.put((job, "done", work(job)))
+        except CancelledError:
+            self.results.put((job, "cancelled", None))
+        except Exception as e:
+            self.results.put((job, "error", e))
+
+    def _poll(self):
+        while True:
+            try:
+                job, kind, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            current = self.active.get(job.channel) is job and not job.cancelled.is_set()
+            if kind == "progress":
+                if current and self.on_progress:
+                    self.on_progress(value)
+                continue
+            if not current:
+                continue
+            del self.active[job.channel]
+            if kind == "done":
+                job.on_done(value)
+            elif kind == "error" and job.on_error:
+                job.on_error(value)
+
+        if self.active:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self.polling = False
+
+
+def write_chunks(job, file_path, chunks, total=None, buffer_size=WRITE_CHUNK_SIZE, previous=None):
+    # Returns (digest, size, written). The file is replaced only if not
+    # cancelled, and not at all when it matches the previous manifest entry
+    name = os.path.basename(file_path)
+
+    def flushed(written):
+        job.check()
+        if total:
+            job.progress(f"⏳ Writing {name}... {min(100, written * 100 // total)}%")
+        else:
+            job.progress(f"⏳ Writing {name}... {written / 1e6:.1f} MB")
+
+    return write_if_changed(file_path, chunks, previous, buffer_size, on_flush=flushed)
+
+
+def write_text(job, file_path, text, chunk_size=WRITE_CHUNK_SIZE, previous=None):
+    return write_chunks(job, file_path, [text], total=len(text), buffer_size=chunk_size, previous=previous)
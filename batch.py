@@ -0,0 +1,255 @@
+import json
+import os
+import time
+
+import audit
+import instrument
+from minify import OutputStage, format_savings, minify_html
+from perf import PerfStylesheet, long_list, perf_stylesheet
+from render_cache import RenderCache
+from site_spec import SiteSpec, load_table
+from stylesheet import shared_stylesheet
+from sync import BuildManifest, write_if_changed
+from templates import TEMPLATES, iter_template
+
+_cache = None
+_stage = None
+_shared_css = None
+_perf = None
+_budgets = None
+# Linked stylesheets the auditor has parsed in this process
+_sheets = {}
+
+
+def init_worker(cache_dir=None, minify=False, gzip_level=None, shared_css=False, timings=False, budgets=None,
+                perf=False):
+    global _cache, _stage, _shared_css, _perf, _budgets
+    instrument.enable(timings)
+    _cache = RenderCache(disk_dir=cache_dir) if cache_dir else None
+    _stage = OutputStage(minify, gzip_level) if minify or gzip_level is not None else None
+    # Stylesheets are keyed by the minify flag since it changes their hash
+    _shared_css = (minify,) if shared_css else None
+    _perf = (minify,) if perf else None
+    # With budgets every page is audited as it is written
+    _budgets = budgets or None
+
+
+def load_specs(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: invalid spec: {e}")
+
+
+def read_specs(path):
+    # CSV specs are loaded into a columnar SpecTable; JSONL streams as dicts
+    if path.lower().endswith(".csv"):
+        return load_table(path)
+    return load_specs(path)
+
+
+def normalize_spec(spec):
+    # Same shape as WebsiteBuilder.get_user_data, with GUI defaults for missing keys
+    if isinstance(spec, SiteSpec):
+        return spec
+    features = spec.get("features", [])
+    if isinstance(features, str):
+        features = features.split(",")
+    social = spec.get("social") or {}
+    data = {
+        "name": spec.get("name", "My Awesome Website"),
+        "description": spec.get("description", ""),
+        "email": spec.get("email", ""),
+        "phone": spec.get("phone", ""),
+        "color": spec.get("color", "#2563eb"),
+        "features": [f.strip() for f in features],
+        "social": {
+            "facebook": social.get("facebook", ""),
+            "twitter": social.get("twitter", ""),
+            "linkedin": social.get("linkedin", "")
+        }
+    }
+    for key in ("products", "posts"):
+        if spec.get(key) is not None:
+            data[key] = spec[key]
+    return data
+
+
+def output_name(spec, used):
+    base = str(spec.get("slug") or spec.get("name") or "website").replace(' ', '_').lower()
+    base = "".join(c for c in base if c.isalnum() or c in "_-.") or "website"
+    name = base
+    n = 1
+    while name in used:
+        n += 1
+        name = f"{base}-{n}"
+    used.add(name)
+    return name + ".html"
+
+
+def render_job(job):
+    # Returns (file_path, size, hit, error, savings, (digest, written), stages,
+    # violations); stages are this job's timings when instrumentation is on,
+    # violations the budgets the page exceeds
+    template, data, file_path, previous = job
+    if template not in TEMPLATES:
+        return file_path, 0, False, f"unknown template '{template}'", None, None, (), ()
+    auditor = audit.PageAuditor(os.path.dirname(file_path), _sheets) if _budgets else None
+    timings = instrument.begin("build")
+    try:
+        with timings.stage("normalize"):
+            data = normalize_spec(data)
+        sheet = _stylesheet(template, data)
+        if sheet is not None:
+            render_fn, stream_fn, variant = sheet.render, sheet.iter_render, sheet.filename
+        else:
+            render_fn, stream_fn, variant = TEMPLATES[template], None, None
+        if _cache is not None:
+            with timings.stage("render"):
+                html_content, hit = _cache.render(template, data, render_fn, variant)
+        elif _stage is not None:
+            with timings.stage("render"):
+                html_content, hit = render_fn(data), False
+        else:
+            # Rendering and writing are interleaved when streaming
+            with timings.stage("stream"):
+                chunks = stream_fn(data) if stream_fn else iter_template(template, data)
+                if auditor is not None:
+                    chunks = audit.tee(chunks, auditor)
+                digest, size, written = write_if_changed(file_path, chunks, previous)
+                timings.add_bytes(size if written else 0)
+            return (file_path, size, False, None, None, (digest, written), timings.stages,
+                    _violations(auditor, timings))
+        with timings.stage("write"):
+            if _stage is None:
+                digest, size, written = write_if_changed(file_path, [html_content], previous)
+                savings = None
+            else:
+                sizes, digest, written = _stage.write(file_path, html_content, template, previous)
+                size, savings = sizes[1], (template,) + sizes
+            timings.add_bytes(size if written else 0)
+        if auditor is not None:
+            # The page as written, so minified when minifying
+            auditor.feed(minify_html(html_content) if _stage is not None and _stage.minify else html_content)
+        return file_path, size, hit, None, savings, (digest, written), timings.stages, _violations(auditor, timings)
+    except Exception as e:
+        return file_path, 0, False, str(e), None, None, (), ()
+
+
+def _violations(auditor, timings):
+    if auditor is None:
+        return ()
+    with timings.stage("audit"):
+        return audit.over_budget(auditor.result()["metrics"], _budgets)
+
+
+def _stylesheet(template, data):
+    # Perf pages for long lists, shared CSS when asked for, else None
+    if _perf is not None and long_list(template, data):
+        return perf_stylesheet(template, *_perf)
+    if _shared_css is not None:
+        return shared_stylesheet(template, *_shared_css)
+    return None
+
+
+def iter_jobs(specs, out_dir, manifest, stylesheets=None):
+    # With stylesheets (a dict), each template's shared CSS is written the
+    # first time a page needs it, before any page linking to it
+    used = set()
+    for spec in specs:
+        template = spec.get("template", "Business")
+        sheet = _stylesheet(template, spec) if stylesheets is not None and template in TEMPLATES else None
+        key = f"{template} (perf)" if isinstance(sheet, PerfStylesheet) else template
+        if sheet is not None and key not in stylesheets:
+            new = not os.path.exists(os.path.join(out_dir, sheet.filename))
+            stylesheets[key] = sheet.write(out_dir, _stage.gzip_level if _stage else None)
+            if stylesheets[key] is not None:
+                manifest.add_asset(stylesheets[key], new)
+        file_path = os.path.join(out_dir, output_name(spec, used))
+        yield template, spec, file_path, manifest.previous(file_path)
+
+
+def build(spec_path, out_dir, workers=None, chunksize=64, cache_dir=None, minify=False, gzip_level=None,
+          shared_css=False, force=False, prune=False, changes_path=None, budgets=None, perf=False):
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    stats = {"sites": 0, "bytes": 0, "cache_hits": 0, "unchanged": 0, "errors": [], "savings": {},
+             "stylesheets": {}, "over_budget": []}
+    options = (cache_dir, minify, gzip_level, shared_css, instrument.recorder.enabled, budgets, perf)
+    # The parent writes the shared stylesheets, so it needs the same settings
+    init_worker(*options)
+    manifest = BuildManifest(out_dir, force)
+    jobs = iter_jobs(read_specs(spec_path), out_dir, manifest, stats["stylesheets"] if shared_css or perf else None)
+    siblings = gzip_level is not None
+
+    if workers == 1:
+        for result in map(render_job, jobs):
+            _record(stats, manifest, siblings, *result)
+    else:
+        # Imported here so worker processes, which import this module, skip it
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=options) as executor:
+            for result in executor.map(render_job, jobs, chunksize=chunksize):
+                _record(stats, manifest, siblings, *result)
+
+    stats["stale"] = manifest.prune(remove=prune)
+    manifest.save()
+    if changes_path:
+        manifest.write_changes(changes_path)
+    stats["changes"] = manifest.counts()
+    stats["elapsed"] = time.perf_counter() - start
+    stats["sites_per_sec"] = stats["sites"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    return stats
+
+
+def _record(stats, manifest, siblings, file_path, size, hit, error, savings, entry, stages, violations):
+    if stages:
+        instrument.recorder.record("build", stages)
+    if error:
+        stats["errors"].append((file_path, error))
+        manifest.keep(file_path)
+        return
+    if violations:
+        stats["over_budget"].append((file_path, violations))
+    digest, written = entry
+    manifest.record(file_path, digest, size, written, (file_path + ".gz",) if siblings else ())
+    stats["sites"] += 1
+    stats["bytes"] += size
+    stats["cache_hits"] += hit
+    stats["unchanged"] += not written
+    if savings:
+        total = stats["savings"].setdefault(savings[0], [0, 0, 0, 0])
+        total[0] += 1
+        for i, value in enumerate(savings[1:], 1):
+            total[i] += value
+
+
+def format_report(stats):
+    report = (f"✓ Built {stats['sites']} sites ({stats['bytes'] / 1e6:.1f} MB) "
+              f"in {stats['elapsed']:.2f}s — {stats['sites_per_sec']:.1f} sites/sec")
+    if stats["cache_hits"]:
+        report += f" ({stats['cache_hits']} from cache)"
+    changes = stats["changes"]
+    report += (f"\n  {changes['A']} added, {changes['M']} modified, {changes['D']} removed, "
+               f"{stats['unchanged']} unchanged")
+    if stats["stale"] and not changes["D"]:
+        report += f"; {len(stats['stale'])} stale file(s) kept (use --prune to remove)"
+    if stats["savings"]:
+        report += "\n" + format_savings(stats["savings"])
+    for template, file_path in sorted(stats["stylesheets"].items()):
+        if file_path is None:
+            continue
+        report += f"\n  {template}: shared {os.path.basename(file_path)} ({os.path.getsize(file_path) / 1024:.1f} KB)"
+    if stats["over_budget"]:
+        report += f"\n✗ {len(stats['over_budget'])} page(s) over budget"
+        for file_path, violations in stats["over_budget"][:audit.MAX_LISTED]:
+            report += f"\n✗ {file_path}: {audit.format_violations(violations)}"
+    for file_path, error in stats["errors"]:
+        report += f"\n✗ {file_path}: {error}"
+    return report
@@ -0,0 +1,280 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from templates import STREAMING_TEMPLATES, TEMPLATES, TEMPLATE_VERSION
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000, 100000]
+# Keep each measurement around this long by repeating small renders
+TARGET_SECONDS = 0.2
+MAX_REPEATS = 1000
+REGRESSION_THRESHOLD = 0.10
+# Import-to-first-render budget for a freshly spawned worker process
+STARTUP_BUDGET_MS = 50
+STARTUP_RUNS = 5
+
+# Runs in a fresh interpreter: the same imports and first render a batch worker does
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import batch
+imported = time.perf_counter()
+batch.TEMPLATES[sys.argv[1]](batch.normalize_spec({"template": sys.argv[1]}))
+rendered = time.perf_counter()
+print(json.dumps({"import": imported - start, "render": rendered - imported,
+                  "tkinter": "tkinter" in sys.modules, "modules": len(sys.modules)}))
+"""
+
+
+def synthetic_spec(template, size):
+    # Grow the repeated part each template actually renders
+    data = {
+        "name": "Benchmark Co",
+        "description": "Synthetic site used to measure render cost across input sizes.",
+        "email": "bench@example.com",
+        "phone": "+1 (555) 000-0000",
+        "color": "#2563eb",
+        "features": [f"Feature {i}" for i in range(size)],
+        "social": {
+            "facebook": "https://facebook.com/bench",
+            "twitter": "https://twitter.com/bench",
+            "linkedin": "https://linkedin.com/company/bench"
+        }
+    }
+    if template == "E-commerce":
+        data["products"] = [{"name": f"Product {i}", "price": f"${i % 500 + 0.99:.2f}"} for i in range(size)]
+    elif template == "Blog":
+        data["posts"] = [{"title": f"Post {i}", "summary": f"Summary of post {i}.", "href": f"posts/{i}.html"}
+                         for i in range(size)]
+    return data
+
+
+def render_once(template, data, mode):
+    if mode == "stream":
+        size = 0
+        for chunk in STREAMING_TEMPLATES[template](data):
+            size += len(chunk.encode("utf-8"))
+        return size
+    return len(TEMPLATES[template](data).encode("utf-8"))
+
+
+def best_time(fn):
+    # (best seconds per call, repeats per timing run)
+    start = time.perf_counter()
+    fn()
+    single = time.perf_counter() - start
+    repeats = max(1, min(MAX_REPEATS, int(TARGET_SECONDS / single) if single else MAX_REPEATS))
+    best = single
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeats)
+    return best, repeats
+
+
+def measure(template, size, mode):
+    data = synthetic_spec(template, size)
+    output_bytes = render_once(template, data, mode)
+    best, repeats = best_time(lambda: render_once(template, data, mode))
+
+    # Allocation peak is measured separately since tracemalloc slows rendering
+    tracemalloc.start()
+    render_once(template, data, mode)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "template": template,
+        "size": size,
+        "mode": mode,
+        "seconds": best,
+        "repeats": repeats,
+        "peak_bytes": peak,
+        "output_bytes": output_bytes
+    }
+
+
+def measure_startup(template, runs=STARTUP_RUNS):
+    # Best of several cold starts; "process" also includes interpreter startup
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, template], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+        process = time.perf_counter() - start
+        sample = json.loads(output)
+        sample["process"] = process
+        if best is None or sample["import"] + sample["render"] < best["import"] + best["render"]:
+            best = sample
+    return {
+        "template": template,
+        "import_seconds": best["import"],
+        "first_render_seconds": best["render"],
+        "process_seconds": best["process"],
+        "modules": best["modules"],
+        "tkinter": best["tkinter"]
+    }
+
+
+def startup_failures(startup, budget_ms=STARTUP_BUDGET_MS):
+    failures = []
+    for result in startup:
+        total_ms = (result["import_seconds"] + result["first_render_seconds"]) * 1e3
+        if result["tkinter"]:
+            failures.append(f"{result['template']}: worker imported tkinter")
+        if total_ms > budget_ms:
+            failures.append(f"{result['template']}: import to first render {total_ms:.1f} ms "
+                            f"over the {budget_ms} ms budget")
+    return failures
+
+
+def format_startup(result):
+    return (f"{result['template']:>12} startup  import {result['import_seconds'] * 1e3:7.1f} ms  "
+            f"first render {result['first_render_seconds'] * 1e3:6.1f} ms  "
+            f"process {result['process_seconds'] * 1e3:7.1f} ms  {result['modules']} modules")
+
+
+def measure_locales(template, size, codes):
+    # One-pass render of the first 1..len(codes) locales, against rendering
+    # the page once for each of those locales on its own; "per_locale" is
+    # the cost each extra locale adds to the one pass
+    from locales import LocaleRenderer
+    data = synthetic_spec(template, size)
+    separate = []
+    for code in codes:
+        renderer = LocaleRenderer([code])
+        separate.append(best_time(lambda: renderer.render(template, data))[0])
+    results = []
+    for count in range(1, len(codes) + 1):
+        renderer = LocaleRenderer(codes[:count])
+        seconds = best_time(lambda: renderer.render(template, data))[0]
+        results.append({
+            "template": template,
+            "size": size,
+            "locales": count,
+            "seconds": seconds,
+            "separate_seconds": sum(separate[:count]),
+            "per_locale_seconds": (seconds - results[0]["seconds"]) / (count - 1) if results else seconds
+        })
+    return results
+
+
+def format_locales(result):
+    return (f"{result['template']:>12} locales={result['locales']:<2} n={result['size']:<6} "
+            f"{result['seconds'] * 1e3:9.3f} ms  (separate renders {result['separate_seconds'] * 1e3:9.3f} ms)  "
+            f"+{result['per_locale_seconds'] * 1e3:.3f} ms per locale")
+
+
+def measure_perf(template, size):
+    # Before/after of a --perf page: live DOM elements, <head> bytes,
+    # render-blocking CSS and gzip transfer (page plus deferred stylesheet)
+    import perf
+    result = perf.compare(template, synthetic_spec(template, size))
+    result.update(template=template, size=size)
+    return result
+
+
+def format_perf(result):
+    import perf
+    return f"{result['template']:>12}   perf n={result['size']:<6} {perf.format_compare(result)}"
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes=DEFAULT_SIZES, templates=None, modes=("render", "stream"), progress=None, startup=False,
+        locales=None, perf=False):
+    results = []
+    startup_results = []
+    locale_results = []
+    perf_results = []
+    for template in templates or TEMPLATES:
+        if startup:
+            startup_results.append(measure_startup(template))
+            if progress:
+                progress(startup_results[-1])
+        for size in sizes:
+            for mode in modes:
+                result = measure(template, size, mode)
+                results.append(result)
+                if progress:
+                    progress(result)
+            if locales:
+                for result in measure_locales(template, size, locales):
+                    locale_results.append(result)
+                    if progress:
+                        progress(result)
+            if perf:
+                perf_results.append(measure_perf(template, size))
+                if progress:
+                    progress(perf_results[-1])
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "template_version": TEMPLATE_VERSION,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        },
+        "results": results,
+        "startup": startup_results,
+        "locales": locale_results,
+        "perf": perf_results
+    }
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    # Returns (template, size, mode, old_seconds, new_seconds) for every
+    # measurement that got slower by more than threshold
+    old = {(r["template"], r["size"], r["mode"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = old.get((result["template"], result["size"], result["mode"]))
+        if previous and result["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append((result["template"], result["size"], result["mode"],
+                                previous["seconds"], result["seconds"]))
+    return regressions
+
+
+def format_result(result):
+    if "import_seconds" in result:
+        return format_startup(result)
+    if "locales" in result:
+        return format_locales(result)
+    if "before" in result:
+        return format_perf(result)
+    return (f"{result['template']:>12} {result['mode']:>6} n={result['size']:<6} "
+            f"{result['seconds'] * 1e3:9.3f} ms  peak {result['peak_bytes'] / 1024:9.1f} KB  "
+            f"out {result['output_bytes'] / 1024:9.1f} KB")
+
+
+def format_regressions(regressions, threshold=REGRESSION_THRESHOLD):
+    if not regressions:
+        return f"✓ No regressions over {threshold:.0%}"
+    lines = [f"✗ {len(regressions)} regression(s) over {threshold:.0%}:"]
+    for template, size, mode, old, new in regressions:
+        lines.append(f"  {template} {mode} n={size}: {old * 1e3:.3f} ms → {new * 1e3:.3f} ms "
+                     f"(+{(new / old - 1) * 100:.0f}%)")
+    return "\n".join(lines)
+
+
+def save(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,311 @@
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+import search_index
+import templates
+from output import stream_to_file
+from stylesheet import shared_stylesheet
+
+DEFAULT_PAGE_SIZE = 10
+MANIFEST_NAME = ".blog-manifest.json"
+POST_EXTENSIONS = (".md", ".txt")
+SUMMARY_LENGTH = 200
+
+
+def content_hash(*parts):
+    if len(parts) == 1 and isinstance(parts[0], bytes):
+        return hashlib.sha1(parts[0]).hexdigest()
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "post"
+
+
+def parse_post(path, raw=None):
+    # "key: value" header lines (title, date, tags), a blank line, then
+    # paragraphs separated by blank lines
+    if raw is None:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    text = raw.decode("utf-8").replace("\r\n", "\n")
+    header, _, body = text.partition("\n\n")
+    meta = {}
+    for line in header.split("\n"):
+        key, sep, value = line.partition(":")
+        if sep:
+            meta[key.strip().lower()] = value.strip()
+    if not meta:
+        body = text
+
+    paragraphs = [" ".join(p.split()) for p in body.split("\n\n") if p.strip()]
+    summary = paragraphs[0] if paragraphs else ""
+    if len(summary) > SUMMARY_LENGTH:
+        summary = summary[:SUMMARY_LENGTH].rsplit(" ", 1)[0] + "…"
+
+    date = meta.get("date", "")
+    try:
+        date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        date = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+
+    post = {
+        "title": html.escape(meta.get("title") or os.path.splitext(os.path.basename(path))[0]),
+        "date": date,
+        "tags": sorted({t.strip() for t in meta.get("tags", "").split(",") if t.strip()}),
+        "summary": html.escape(summary),
+        "hash": content_hash(raw)
+    }
+    body_html = "\n            ".join(f"<p>{html.escape(p)}</p>" for p in paragraphs)
+    return post, body_html
+
+
+def display_date(date):
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%B %d, %Y")
+
+
+def tag_slug(tag, slugs):
+    # Tags that slugify alike ("C", "C++") get -2, -3 suffixes
+    slug = slugs.get(tag)
+    if slug is None:
+        base = re.sub(r"[^a-z0-9]+", "-", tag.lower()).strip("-") or "tag"
+        slug = base
+        n = 1
+        while slug in slugs.values():
+            n += 1
+            slug = f"{base}-{n}"
+        slugs[tag] = slug
+    return slug
+
+
+def listing_paths(tag, tag_slugs):
+    # (landing page, archive page pattern) for the main index or a tag.
+    # Slugs have no dots, so a tag's archive pages never take the name of
+    # another tag's landing page ("c-2.html" for both C and C++).
+    if tag is None:
+        return "index.html", "archive-{}.html"
+    slug = tag_slugs[tag]
+    return f"tags/{slug}.html", f"tags/{slug}.{{}}.html"
+
+
+def pagination_html(newer, older):
+    links = []
+    if newer:
+        links.append(f'<a href="{os.path.basename(newer)}">← Newer</a>')
+    if older:
+        links.append(f'<a href="{os.path.basename(older)}">Older →</a>')
+    if not links:
+        return ""
+    return '\n    <nav class="pagination">' + " ".join(links) + '</nav>'
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    temp_path = path + ".tmp"
+    # json.dumps uses the C encoder; json.dump to a file does not
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(manifest, separators=(",", ":")))
+    os.replace(temp_path, path)
+
+
+def scan_posts(posts_dir, old_posts):
+    # Unchanged files (same mtime and size) reuse manifest metadata unread
+    posts = {}
+    bodies = {}
+    changed = set()
+    for entry in sorted(os.scandir(posts_dir), key=lambda e: e.name):
+        stem, ext = os.path.splitext(entry.name)
+        if ext.lower() not in POST_EXTENSIONS or not entry.is_file():
+            continue
+        slug = slugify(stem)
+        if slug in posts:
+            slug = f"{slug}-{content_hash(entry.name)[:6]}"
+        stat = entry.stat()
+        old = old_posts.get(slug)
+        if old and old["file"] == entry.path and old["mtime"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+            posts[slug] = old
+            continue
+        post, body_html = parse_post(entry.path)
+        post.update(file=entry.path, mtime=stat.st_mtime_ns, size=stat.st_size)
+        posts[slug] = post
+        bodies[slug] = body_html
+        if not old or old["hash"] != post["hash"]:
+            changed.add(slug)
+    return posts, bodies, changed
+
+
+def plan_pages(posts, site_hash, page_size):
+    # Every output page with the hash of exactly the inputs it renders, the
+    # post -> page dependency edges, and each tag's slug. Slugs are handed
+    # out in tag order, so a post's hash holds its tags' slugs, which a new
+    # tag can shift.
+    tag_slugs = {}
+    for tag in sorted({tag for post in posts.values() for tag in post["tags"]}):
+        tag_slug(tag, tag_slugs)
+    plan = {}
+    edges = {slug: [f"posts/{slug}.html"] for slug in posts}
+    for slug, post in posts.items():
+        tags = [(tag, tag_slugs[tag]) for tag in post["tags"]]
+        plan[f"posts/{slug}.html"] = ("post", slug, content_hash(site_hash, post["hash"], post["date"], tags))
+
+    ordered = sorted(posts, key=lambda slug: (posts[slug]["date"], slug), reverse=True)
+    listings = [(None, ordered)]
+    by_tag = {}
+    for slug in ordered:
+        for tag in posts[slug]["tags"]:
+            by_tag.setdefault(tag, []).append(slug)
+    listings += sorted(by_tag.items())
+
+    for tag, slugs in listings:
+        # Archive pages are anchored at the oldest post, so a new post only
+        # touches the landing page and the newest archive page
+        landing, archive = listing_paths(tag, tag_slugs)
+        oldest_first = slugs[::-1]
+        chunks = [oldest_first[i:i + page_size][::-1] for i in range(0, len(oldest_first), page_size)]
+        count = len(chunks)
+        first_older = (len(slugs) - 1 - page_size) // page_size + 1 if len(slugs) > page_size else None
+        pages = [(landing, slugs[:page_size], None, archive.format(first_older) if first_older else None)]
+        for number, chunk in enumerate(chunks, 1):
+            newer = archive.format(number + 1) if number < count else landing
+            older = archive.format(number - 1) if number > 1 else None
+            pages.append((archive.format(number), chunk, newer, older))
+
+        for path, page, newer, older in pages:
+            entries = [(slug, posts[slug]["title"], posts[slug]["date"], posts[slug]["summary"]) for slug in page]
+            plan[path] = ("listing", (tag, page, newer, older), content_hash(site_hash, tag, entries, newer, older))
+            for slug in page:
+                edges[slug].append(path)
+    return plan, edges, tag_slugs
+
+
+def page_template(site, sheet, prefix, search=False, **options):
+    # (template, values) for a blog page; prefix leads back to the blog root
+    if search:
+        options["search"] = search_index.search_widget(prefix)
+    if sheet is None:
+        return templates.BLOG_SITE, templates.blog_values(site, stream=True, **options)
+    return sheet.page, sheet.values(site, prefix, stream=True, **options)
+
+
+def render_listing(site, posts, tag, page, newer, older, sheet=None, search=False):
+    prefix = "../" if tag else ""
+    articles = [templates.BLOG_SUMMARY.render({
+        "title": posts[slug]["title"],
+        "date": display_date(posts[slug]["date"]),
+        "summary": posts[slug]["summary"],
+        "href": f"{prefix}posts/{slug}.html"
+    }) for slug in page]
+    template, values = page_template(site, sheet, prefix, search, articles=articles,
+                                     pagination=pagination_html(newer, older))
+    if tag:
+        values["description"] = f"Posts tagged “{html.escape(tag)}”"
+    return template.iter_render(values)
+
+
+def render_post(site, post, body_html, tag_slugs, sheet=None, search=False):
+    tags = "".join(f' · <a href="../{listing_paths(tag, tag_slugs)[0]}">{html.escape(tag)}</a>'
+                   for tag in post["tags"])
+    article = templates.BLOG_ARTICLE.render({
+        "title": post["title"],
+        "date": display_date(post["date"]),
+        "tags": tags,
+        "body": body_html,
+        "back": "../index.html"
+    })
+    template, values = page_template(site, sheet, "../", search, articles=[article])
+    return template.iter_render(values)
+
+
+def build_index(posts, out_dir):
+    # Titles, tags and summaries of every post, newest first; bodies are not
+    # indexed, so unchanged posts are never re-read for it
+    index = search_index.SearchIndexBuilder(out_dir)
+    try:
+        for slug in sorted(posts, key=lambda slug: (posts[slug]["date"], slug), reverse=True):
+            post = posts[slug]
+            index.add(f"posts/{slug}.html", post["title"], " ".join(post["tags"] + [post["summary"]]),
+                      display_date(post["date"]))
+    except BaseException:
+        index.close()
+        raise
+    return index.finish()
+
+
+def build_blog(site, posts_dir, out_dir, page_size=DEFAULT_PAGE_SIZE, force=False, shared_css=False,
+               search=False):
+    start = time.perf_counter()
+    os.makedirs(os.path.join(out_dir, "posts"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "tags"), exist_ok=True)
+    manifest = {} if force else load_manifest(out_dir)
+    sheet = shared_stylesheet("Blog site") if shared_css else None
+    if sheet is not None:
+        sheet.write(out_dir)
+    site_hash = content_hash(site, templates.TEMPLATE_VERSION, page_size, sheet and sheet.filename, search)
+
+    posts, bodies, changed = scan_posts(posts_dir, manifest.get("posts", {}))
+    plan, edges, tag_slugs = plan_pages(posts, site_hash, page_size)
+    old_pages = manifest.get("pages", {})
+    stats = {"posts": len(posts), "changed_posts": len(changed), "written": 0, "skipped": 0,
+             "removed": 0, "bytes": 0}
+
+    for path, (kind, payload, input_hash) in plan.items():
+        file_path = os.path.join(out_dir, path)
+        if old_pages.get(path) == input_hash and os.path.exists(file_path):
+            stats["skipped"] += 1
+            continue
+        if kind == "post":
+            post = posts[payload]
+            if payload not in bodies:
+                bodies[payload] = parse_post(post["file"])[1]
+            chunks = render_post(site, post, bodies.pop(payload), tag_slugs, sheet, search)
+        else:
+            chunks = render_listing(site, posts, *payload, sheet=sheet, search=search)
+        stats["bytes"] += stream_to_file(file_path, chunks)
+        stats["written"] += 1
+
+    for path in old_pages.keys() - plan.keys():
+        try:
+            os.remove(os.path.join(out_dir, path))
+            stats["removed"] += 1
+        except FileNotFoundError:
+            pass
+
+    # The index only changes when a post's content or date does
+    index_hash = None
+    if search:
+        index_hash = content_hash(search_index.INDEX_VERSION,
+                                  sorted((slug, post["hash"], post["date"]) for slug, post in posts.items()))
+        meta_path = os.path.join(out_dir, search_index.INDEX_DIR, "meta.json")
+        if manifest.get("search") != index_hash or not os.path.exists(meta_path):
+            stats["search"] = build_index(posts, out_dir)
+
+    for slug, post in posts.items():
+        post["pages"] = edges[slug]
+    save_manifest(out_dir, {
+        "site": site_hash,
+        "posts": posts,
+        "pages": {path: input_hash for path, (_, _, input_hash) in plan.items()},
+        "search": index_hash
+    })
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def format_report(stats):
+    return (f"✓ Blog: {stats['posts']} posts ({stats['changed_posts']} changed), "
+            f"{stats['written']} pages written, {stats['skipped']} unchanged, "
+            f"{stats['removed']} removed ({stats['bytes'] / 1e6:.1f} MB) in {stats['elapsed']:.2f}s" +
+            ("\n" + search_index.format_report(stats["search"]) if "search" in stats else ""))
@@ -0,0 +1,224 @@
+import csv
+import html
+import json
+import os
+import re
+import time
+
+import search_index
+import templates
+from output import stream_to_file
+from stylesheet import shared_stylesheet
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_PAGE_SIZE = 48
+# In-flight page jobs per worker; bounds memory on huge catalogs
+MAX_PENDING_PER_WORKER = 4
+
+CATEGORY_CARD = templates.compile_template('''<div class="product">
+                <div class="product-image">🗂️</div>
+                <h3><a href="{href}">{category}</a></h3>
+                <p class="price">{count} products</p>
+            </div>''')
+
+_site = None
+_out_dir = None
+_sheet = None
+_search = False
+
+
+def iter_products(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            yield normalize_product(row)
+
+
+def normalize_product(row):
+    price = str(row.get("price") or "")
+    try:
+        price = f"${float(price.lstrip('$').replace(',', '')):.2f}"
+    except ValueError:
+        pass
+    category = str(row.get("category") or "").strip() or "All Products"
+    return {
+        "name": html.escape(str(row.get("name") or "")),
+        "price": html.escape(price),
+        "category": category
+    }
+
+
+def paginate(products, page_size=DEFAULT_PAGE_SIZE):
+    # Yields (category, page_number, products, has_next) in one pass. A full
+    # page is held back until the next product in its category shows up, so
+    # at most two pages per category are in memory.
+    state = {}
+    for product in products:
+        category = product["category"]
+        entry = state.get(category)
+        if entry is None:
+            entry = state[category] = [0, None, []]
+        entry[2].append(product)
+        if len(entry[2]) == page_size:
+            if entry[1] is not None:
+                entry[0] += 1
+                yield category, entry[0], entry[1], True
+            entry[1], entry[2] = entry[2], []
+
+    for category, (number, full, current) in state.items():
+        if full is not None:
+            number += 1
+            yield category, number, full, bool(current)
+        if current:
+            yield category, number + 1, current, False
+
+
+def category_slug(category, slugs):
+    slug = slugs.get(category)
+    if slug is None:
+        base = re.sub(r"[^a-z0-9]+", "-", category.lower()).strip("-") or "category"
+        slug = base
+        n = 1
+        while slug in slugs.values():
+            n += 1
+            slug = f"{base}-{n}"
+        slugs[category] = slug
+    return slug
+
+
+def pagination_html(number, has_next):
+    links = ['<a href="../index.html">All Categories</a>']
+    if number > 1:
+        links.append(f'<a href="page-{number - 1}.html">← Previous</a>')
+    links.append(f'<span>Page {number}</span>')
+    if has_next:
+        links.append(f'<a href="page-{number + 1}.html">Next →</a>')
+    return '\n    <nav class="pagination">' + " ".join(links) + '</nav>'
+
+
+def init_worker(site, out_dir, shared_css=False, search=False):
+    global _site, _out_dir, _sheet, _search
+    _site = site
+    _out_dir = out_dir
+    _sheet = shared_stylesheet("Catalog") if shared_css else None
+    _search = search
+
+
+def page_template(site, prefix, **options):
+    # (template, values) for a shop page; prefix leads back to the shop root
+    if _search:
+        options["search"] = search_index.search_widget(prefix)
+    if _sheet is None:
+        return templates.CATALOG, templates.ecommerce_values(site, stream=True, **options)
+    return _sheet.page, _sheet.values(site, prefix, stream=True, **options)
+
+
+def render_page(job):
+    category, slug, number, products, has_next = job
+    os.makedirs(os.path.join(_out_dir, slug), exist_ok=True)
+    file_path = os.path.join(_out_dir, slug, f"page-{number}.html")
+    template, values = page_template(_site, "../", products=products, title=html.escape(category),
+                                     pagination=pagination_html(number, has_next))
+    return len(products), stream_to_file(file_path, template.iter_render(values), atomic=False)
+
+
+def render_index(site, counts, slugs, out_dir):
+    cards = [CATEGORY_CARD.render({"href": f"{slugs[category]}/page-1.html",
+                                   "category": html.escape(category), "count": str(count)})
+             for category, count in sorted(counts.items())]
+    template, values = page_template(site, "", title="Shop by Category")
+    values["products"] = "\n".join(cards)
+    return stream_to_file(os.path.join(out_dir, "index.html"), template.iter_render(values))
+
+
+def build_catalog(site, products_path, out_dir, page_size=DEFAULT_PAGE_SIZE, workers=None, shared_css=False,
+                  search=False):
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    stats = {"products": 0, "pages": 0, "bytes": 0}
+    init_worker(site, out_dir, shared_css, search)
+    if _sheet is not None:
+        _sheet.write(out_dir)
+    counts = {}
+    slugs = {}
+    # Products are indexed as their pages are queued, so the index streams too
+    index = search_index.SearchIndexBuilder(out_dir) if search else None
+
+    def jobs():
+        for category, number, products, has_next in paginate(iter_products(products_path), page_size):
+            counts[category] = counts.get(category, 0) + len(products)
+            slug = category_slug(category, slugs)
+            if index is not None:
+                href = f"{slug}/page-{number}.html"
+                for product in products:
+                    index.add(href, product["name"], product["category"], product["price"])
+            yield category, slug, number, products, has_next
+
+    def record(result):
+        stats["products"] += result[0]
+        stats["pages"] += 1
+        stats["bytes"] += result[1]
+
+    try:
+        if workers == 1:
+            for job in jobs():
+                record(render_page(job))
+        else:
+            # Imported here so worker processes, which import this module, skip it
+            from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(site, out_dir, shared_css, search)) as executor:
+                limit = (workers or os.cpu_count() or 1) * MAX_PENDING_PER_WORKER
+                pending = set()
+                for job in jobs():
+                    if len(pending) >= limit:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future.result())
+                    pending.add(executor.submit(render_page, job))
+                for future in pending:
+                    record(future.result())
+    except BaseException:
+        if index is not None:
+            index.close()
+        raise
+
+    stats["bytes"] += render_index(site, counts, slugs, out_dir)
+    stats["pages"] += 1
+    if index is not None:
+        stats["search"] = index.finish()
+    stats["categories"] = len(counts)
+    stats["elapsed"] = time.perf_counter() - start
+    stats["products_per_sec"] = stats["products"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    stats["peak_rss_mb"] = peak_rss_mb(children=workers != 1)
+    return stats
+
+
+def peak_rss_mb(children=True):
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux; RUSAGE_CHILDREN covers the worker processes
+    usage = {"builder": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if children:
+        usage["largest_worker"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return usage
+
+
+def format_report(stats):
+    report = (f"✓ Built {stats['pages']} pages for {stats['products']} products in "
+              f"{stats['categories']} categories ({stats['bytes'] / 1e6:.1f} MB) in "
+              f"{stats['elapsed']:.2f}s — {stats['products_per_sec']:.0f} products/sec")
+    if stats["peak_rss_mb"]:
+        report += f"\n  peak RSS: builder {stats['peak_rss_mb']['builder']:.1f} MB"
+        if "largest_worker" in stats["peak_rss_mb"]:
+            report += f", largest worker {stats['peak_rss_mb']['largest_worker']:.1f} MB"
+    if "search" in stats:
+        report += "\n" + search_index.format_report(stats["search"])
+    return report
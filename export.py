@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from batch import normalize_spec, output_name
+from minify import minify_html
+from output import BUFFER_SIZE, stream_to
+from stylesheet import shared_stylesheet
+from templates import TEMPLATES, iter_template
+
+DEFAULT_LEVEL = 6
+# Bytes of an entry held in memory while it renders; larger ones spill to
+# a temp file
+SPOOL_SIZE = 1024 * 1024
+
+
+class ZipExport:
+    # Streams entries into a zip written beside the target and renamed into
+    # place on close. Each entry is rendered into a bounded spool and only
+    # added once complete, so memory stays bounded whatever the number of
+    # entries and a failed render leaves nothing half-written behind.
+    def __init__(self, file_path, level=DEFAULT_LEVEL):
+        self.file_path = file_path
+        self.temp_path = f"{file_path}.{os.getpid()}.tmp"
+        self.level = level
+        self.zip = zipfile.ZipFile(self.temp_path, "w")
+        self.entries = 0
+        self.raw_bytes = 0
+
+    def add(self, name, chunks, level=None):
+        # level 0 stores the entry uncompressed; None uses the archive default
+        level = self.level if level is None else level
+        with tempfile.SpooledTemporaryFile(SPOOL_SIZE) as spool:
+            size = stream_to(spool, chunks)
+            spool.seek(0)
+            self.zip.compression = zipfile.ZIP_DEFLATED if level else zipfile.ZIP_STORED
+            self.zip.compresslevel = level or None
+            with self.zip.open(name, "w") as entry:
+                shutil.copyfileobj(spool, entry, BUFFER_SIZE)
+        self.entries += 1
+        self.raw_bytes += size
+        return size
+
+    def close(self):
+        self.zip.close()
+        os.replace(self.temp_path, self.file_path)
+
+    def abort(self):
+        self.zip.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def export_sites(specs, file_path, level=DEFAULT_LEVEL, asset_level=None, minify=False, shared_css=False,
+                 progress=None):
+    # One entry per site spec, named like the batch build's files, plus each
+    # template's shared stylesheet the first time it is needed
+    start = time.perf_counter()
+    stats = {"sites": 0, "bytes": 0, "assets": 0, "errors": []}
+    used = set()
+    assets = set()
+    with ZipExport(file_path, level) as archive:
+        for spec in specs:
+            template = spec.get("template", "Business")
+            name = output_name(spec, used)
+            if template not in TEMPLATES:
+                stats["errors"].append((name, f"unknown template '{template}'"))
+                continue
+            try:
+                data = normalize_spec(spec)
+                if shared_css:
+                    sheet = shared_stylesheet(template, minify)
+                    if sheet.filename not in assets:
+                        assets.add(sheet.filename)
+                        archive.add(sheet.filename, [sheet.css], asset_level)
+                        stats["assets"] += 1
+                    chunks = sheet.iter_render(data)
+                else:
+                    chunks = iter_template(template, data)
+                if minify:
+                    # Minifying needs the whole page, so it does not stream
+                    chunks = [minify_html("".join(chunks))]
+                stats["bytes"] += archive.add(name, chunks)
+            except Exception as e:
+                stats["errors"].append((name, str(e)))
+                continue
+            stats["sites"] += 1
+            if progress:
+                progress(stats)
+    stats["compressed"] = os.path.getsize(file_path)
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def format_report(stats, file_path):
+    ratio = stats["compressed"] * 100 / stats["bytes"] if stats["bytes"] else 0
+    report = (f"✓ Exported {stats['sites']} sites" +
+              (f" and {stats['assets']} shared stylesheets" if stats["assets"] else "") +
+              f" to {file_path}: {stats['bytes'] / 1e6:.1f} MB → {stats['compressed'] / 1e6:.1f} MB "
+              f"({ratio:.0f}%) in {stats['elapsed']:.2f}s")
+    for name, error in stats["errors"]:
+        report += f"\n✗ {name}: {error}"
+    return report
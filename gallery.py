@@ -0,0 +1,148 @@
+import hashlib
+import html
+import os
+import re
+import time
+
+from render_cache import spec_key
+from sync import BuildManifest, write_if_changed
+from templates import TEMPLATES, compile_template
+
+GALLERY_PATH = "/gallery/"
+
+GALLERY_PAGE = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name} — every template</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: Arial, sans-serif; background: #f3f4f6; color: #333; padding: 1.5rem; }}
+        h1 {{ font-size: 1.4rem; margin-bottom: 1rem; }}
+        .frames {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(480px, 1fr)); gap: 1.5rem; }}
+        figure {{ background: white; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); overflow: hidden; }}
+        figcaption {{ padding: 0.6rem 1rem; font-weight: bold; border-bottom: 1px solid #e5e7eb; }}
+        figcaption a {{ color: inherit; }}
+        iframe {{ width: 100%; height: 640px; border: 0; display: block; }}
+    </style>
+</head>
+<body>
+    <h1>{name} in every template</h1>
+    <div class="frames">
+        {frames}
+    </div>
+</body>
+</html>''')
+
+GALLERY_FRAME = compile_template('''<figure>
+            <figcaption><a href="{href}" target="_blank">{template}</a></figcaption>
+            <iframe src="{href}" title="{template}" loading="lazy"></iframe>
+        </figure>''')
+
+
+def render_template(template, data):
+    # Module level, so process pool workers can run it
+    return TEMPLATES[template](data)
+
+
+def page_name(template):
+    return (re.sub(r"[^a-z0-9]+", "-", template.lower()).strip("-") or "template") + ".html"
+
+
+def index_page(data, pages):
+    # Frame URLs carry a digest of their page, so the index changes (and a
+    # live index reloads) exactly when some page did
+    frames = [GALLERY_FRAME.render({
+        "href": f"{page_name(name)}?v={hashlib.sha1(page.encode('utf-8')).hexdigest()[:12]}",
+        "template": html.escape(name)
+    }) for name, page in pages.items()]
+    return GALLERY_PAGE.render({"name": html.escape(data.get("name") or ""), "frames": "\n        ".join(frames)})
+
+
+class Gallery:
+    # Renders one spec through every template at once. Pages already in the
+    # RenderCache are reused; the rest render concurrently on a process pool
+    # that is started on first use and kept, so later galleries skip startup.
+    def __init__(self, cache, names=None, workers=None):
+        self.cache = cache
+        self.names = list(names or TEMPLATES)
+        self.workers = workers
+        self.executor = None
+
+    def render(self, data):
+        # ({template: html} in template order, names served from the cache)
+        keys = {name: spec_key(name, data) for name in self.names}
+        pages = {}
+        for name, key in keys.items():
+            page = self.cache.get(key)
+            if page is not None:
+                pages[name] = page
+        hits = set(pages)
+        missing = [name for name in self.names if name not in hits]
+        if len(missing) > 1 and self.workers != 1:
+            futures = {name: self._executor().submit(render_template, name, data) for name in missing}
+            for name, future in futures.items():
+                pages[name] = future.result()
+        else:
+            for name in missing:
+                pages[name] = render_template(name, data)
+        for name in missing:
+            self.cache.put(keys[name], pages[name])
+        return {name: pages[name] for name in self.names}, hits
+
+    def _executor(self):
+        if self.executor is None:
+            # Imported here so headless callers that never render in parallel skip it.
+            # Spawned, not forked: the GUI process runs Tk and server threads.
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            workers = self.workers or min(len(self.names), os.cpu_count() or 1)
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return self.executor
+
+    def publish(self, server, data, pages):
+        # Pages and the index go to the preview server under GALLERY_PATH.
+        # Only the index listens for reloads: browsers allow six connections
+        # per host, fewer than one event stream per frame would need.
+        for name, page in pages.items():
+            server.publish(page, GALLERY_PATH + page_name(name), live=False)
+        server.publish(index_page(data, pages), GALLERY_PATH)
+        return server.url.rstrip("/") + GALLERY_PATH
+
+    def write(self, out_dir, data, pages):
+        # The same gallery as files, for opening without a server
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = BuildManifest(out_dir)
+        written = 0
+        entries = [(page_name(name), page) for name, page in pages.items()]
+        entries.append(("index.html", index_page(data, pages)))
+        for name, page in entries:
+            file_path = os.path.join(out_dir, name)
+            digest, size, changed = write_if_changed(file_path, [page], manifest.previous(file_path))
+            manifest.record(file_path, digest, size, changed)
+            written += changed
+        manifest.save()
+        return written
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def build_gallery(data, out_dir, cache, workers=None):
+    start = time.perf_counter()
+    gallery = Gallery(cache, workers=workers)
+    try:
+        pages, hits = gallery.render(data)
+    finally:
+        gallery.close()
+    written = gallery.write(out_dir, data, pages)
+    return {"templates": len(pages), "cached": len(hits), "written": written,
+            "elapsed": time.perf_counter() - start}
+
+
+def format_report(stats, out_dir):
+    return (f"✓ Gallery: {stats['templates']} templates ({stats['cached']} from cache), "
+            f"{stats['written']} files written to {out_dir} in {stats['elapsed']:.2f}s")
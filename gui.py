@@ -0,0 +1,480 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, filedialog, messagebox, colorchooser
+import os
+import webbrowser
+
+import instrument
+import templates
+from background import BackgroundRunner, write_text
+from gallery import GALLERY_PATH, Gallery
+from minify import DEFAULT_GZIP_LEVEL, OutputStage, format_savings
+from preview_server import PreviewServer
+from render_cache import RenderCache
+from site_spec import SiteSpec, Social
+from sync import BuildManifest
+from virtual_preview import VirtualPreview
+
+LIVE_PREVIEW_DELAY_MS = 150
+
+class WebsiteBuilder:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Automatic Website Builder - Production Ready")
+        self.root.geometry("1000x700")
+        
+        # Color scheme
+        self.primary_color = "#2563eb"
+        self.secondary_color = "#1e40af"
+        
+        # Per-stage timings for every operation; the last breakdown goes in the status bar
+        instrument.enable()
+        
+        # Render cache shared by every Generate click
+        self.cache = RenderCache()
+        
+        # Local preview server, started on first browser preview
+        self.preview_server = None
+        
+        # Every template side by side, with its process pool started on first use
+        self.gallery = None
+        
+        # Templates, compiled on first use
+        self.templates = templates.TEMPLATES
+        
+        self.setup_ui()
+        
+        # Rendering and file I/O run off the Tk thread
+        self.runner = BackgroundRunner(self.root, on_progress=lambda text: self.status.config(text=text))
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        self.runner.shutdown()
+        if self.gallery is not None:
+            self.gallery.close()
+        if self.preview_server is not None:
+            self.preview_server.close()
+        self.root.destroy()
+        
+    def setup_ui(self):
+        # Main container
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configure grid weights
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+        # Title
+        title_label = tk.Label(main_frame, text="🌐 Automatic Website Builder", 
+                              font=("Arial", 20, "bold"), fg=self.primary_color)
+        title_label.grid(row=0, column=0, columnspan=2, pady=10)
+        
+        # Left Panel - Inputs
+        input_frame = ttk.LabelFrame(main_frame, text="Website Configuration", padding="10")
+        input_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
+        
+        # Website Name
+        ttk.Label(input_frame, text="Website Name:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        self.website_name = ttk.Entry(input_frame, width=30)
+        self.website_name.grid(row=0, column=1, pady=5)
+        self.website_name.insert(0, "My Awesome Website")
+        
+        # Template Selection
+        ttk.Label(input_frame, text="Template:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.template_var = tk.StringVar(value="Business")
+        template_combo = ttk.Combobox(input_frame, textvariable=self.template_var, 
+                                     values=list(self.templates.keys()), state="readonly", width=28)
+        template_combo.grid(row=1, column=1, pady=5)
+        
+        # Business Description
+        ttk.Label(input_frame, text="Description:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.description = scrolledtext.ScrolledText(input_frame, width=30, height=4)
+        self.description.grid(row=2, column=1, pady=5)
+        self.description.insert(1.0, "We provide innovative solutions for your business needs.")
+        
+        # Contact Email
+        ttk.Label(input_frame, text="Contact Email:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.email = ttk.Entry(input_frame, width=30)
+        self.email.grid(row=3, column=1, pady=5)
+        self.email.insert(0, "info@example.com")
+        
+        # Phone
+        ttk.Label(input_frame, text="Phone:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.phone = ttk.Entry(input_frame, width=30)
+        self.phone.grid(row=4, column=1, pady=5)
+        self.phone.insert(0, "+1 (555) 123-4567")
+        
+        # Primary Color
+        ttk.Label(input_frame, text="Primary Color:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        color_frame = ttk.Frame(input_frame)
+        color_frame.grid(row=5, column=1, pady=5, sticky=tk.W)
+        self.color_display = tk.Label(color_frame, bg=self.primary_color, width=10, relief="solid")
+        self.color_display.pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(color_frame, text="Choose Color", command=self.choose_color).pack(side=tk.LEFT)
+        
+        # Features
+        ttk.Label(input_frame, text="Features (comma separated):").grid(row=6, column=0, sticky=tk.W, pady=5)
+        self.features = scrolledtext.ScrolledText(input_frame, width=30, height=3)
+        self.features.grid(row=6, column=1, pady=5)
+        self.features.insert(1.0, "Fast Delivery, Quality Service, 24/7 Support")
+        
+        # Social Media
+        ttk.Label(input_frame, text="Social Links:").grid(row=7, column=0, sticky=tk.W, pady=5)
+        social_frame = ttk.Frame(input_frame)
+        social_frame.grid(row=7, column=1, sticky=tk.W)
+        
+        ttk.Label(social_frame, text="Facebook:").pack(anchor=tk.W)
+        self.facebook = ttk.Entry(social_frame, width=30)
+        self.facebook.pack(anchor=tk.W)
+        
+        ttk.Label(social_frame, text="Twitter:").pack(anchor=tk.W)
+        self.twitter = ttk.Entry(social_frame, width=30)
+        self.twitter.pack(anchor=tk.W)
+        
+        ttk.Label(social_frame, text="LinkedIn:").pack(anchor=tk.W)
+        self.linkedin = ttk.Entry(social_frame, width=30)
+        self.linkedin.pack(anchor=tk.W)
+        
+        # Right Panel - Preview & Actions
+        right_frame = ttk.Frame(main_frame)
+        right_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
+        right_frame.rowconfigure(0, weight=1)
+        right_frame.columnconfigure(0, weight=1)
+        
+        # Preview
+        preview_frame = ttk.LabelFrame(right_frame, text="HTML Preview", padding="10")
+        preview_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        preview_frame.rowconfigure(1, weight=1)
+        preview_frame.columnconfigure(1, weight=1)
+        
+        # Jump to any <section id=...> of the previewed page
+        ttk.Label(preview_frame, text="Jump to:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        self.section_var = tk.StringVar()
+        self.section_menu = ttk.Combobox(preview_frame, textvariable=self.section_var, state="readonly")
+        self.section_menu.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=5, pady=(0, 5))
+        self.section_menu.bind("<<ComboboxSelected>>", lambda event: self.preview.jump(self.section_var.get()))
+        
+        # Only the lines around the view are in the widget, so multi-megabyte pages stay responsive
+        self.preview = VirtualPreview(preview_frame, wrap=tk.WORD, width=50, height=20)
+        self.preview.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Buttons
+        button_frame = ttk.Frame(right_frame)
+        button_frame.grid(row=1, column=0, pady=10)
+        
+        ttk.Button(button_frame, text="🔨 Generate Website", 
+                  command=self.generate_website).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="💾 Save to File", 
+                  command=self.save_website).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="🌐 Preview in Browser", 
+                  command=self.preview_in_browser).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="🖼 Gallery",
+                  command=self.show_gallery).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="📦 Export ZIP",
+                  command=self.export_zip).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="⏱ Timings",
+                  command=self.save_timings).pack(side=tk.LEFT, padx=5)
+        
+        # Live preview re-renders on edits, debounced
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Live Preview", variable=self.live_var,
+                        command=self.schedule_live_preview).pack(side=tk.LEFT, padx=5)
+        self.live_after = None
+        
+        # Minify and write a .gz sibling when saving
+        self.optimize_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Minify + .gz", variable=self.optimize_var).pack(side=tk.LEFT, padx=5)
+        for widget in (self.website_name, self.description, self.email, self.phone,
+                       self.features, self.facebook, self.twitter, self.linkedin):
+            widget.bind("<KeyRelease>", self.schedule_live_preview, add="+")
+        self.template_var.trace_add("write", lambda *args: self.schedule_live_preview())
+        
+        # Status Bar
+        self.status = tk.Label(main_frame, text="Ready to build your website", 
+                             bd=1, relief=tk.SUNKEN, anchor=tk.W)
+        self.status.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        
+    def choose_color(self):
+        color = colorchooser.askcolor(title="Choose Primary Color")
+        if color[1]:
+            self.primary_color = color[1]
+            self.color_display.config(bg=self.primary_color)
+            self.schedule_live_preview()
+    
+    def schedule_live_preview(self, event=None):
+        if self.live_after is not None:
+            self.root.after_cancel(self.live_after)
+            self.live_after = None
+        if self.live_var.get():
+            self.live_after = self.root.after(LIVE_PREVIEW_DELAY_MS, self.live_preview)
+    
+    def live_preview(self):
+        self.live_after = None
+        self.generate_website()
+    
+    def show_preview(self, html_content):
+        # Patches only the changed lines of the visible window, keeping the scroll position
+        self.preview.set_text(html_content)
+        self.section_menu.config(values=list(self.preview.sections))
+        if self.section_var.get() not in self.preview.sections:
+            self.section_var.set("")
+            
+    def get_user_data(self):
+        # Raises ValueError for input the templates cannot render
+        return SiteSpec(
+            name=self.website_name.get(),
+            description=self.description.get(1.0, tk.END).strip(),
+            email=self.email.get(),
+            phone=self.phone.get(),
+            color=self.primary_color,
+            features=self.features.get(1.0, tk.END).strip(),
+            social=Social(
+                facebook=self.facebook.get(),
+                twitter=self.twitter.get(),
+                linkedin=self.linkedin.get()
+            ),
+            template=self.template_var.get()
+        )
+    
+    def generate_website(self):
+        template = self.template_var.get()
+        
+        if template not in self.templates:
+            messagebox.showerror("Error", "Invalid template selected")
+            return
+        
+        timings = instrument.begin("generate")
+        try:
+            with timings.stage("get_user_data"):
+                data = self.get_user_data()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+        render_fn = self.templates[template]
+        self.status.config(text=f"⏳ Generating {template} website...")
+        
+        def work(job):
+            with timings.stage("render"):
+                result = self.cache.render(template, data, render_fn)
+                timings.add_bytes(len(result[0]))
+            return result
+        
+        def done(result):
+            html_content, hit = result
+            cached = " (cached)" if hit else ""
+            with timings.stage("preview"):
+                self.show_preview(html_content)
+            breakdown = timings.finish().summary()
+            self.status.config(text=f"✓ {template} website generated successfully!{cached}" +
+                                    (f" — {breakdown}" if breakdown else ""))
+            self.current_html = html_content
+            self.current_template = template
+            if self.preview_server is not None:
+                self.runner.submit("publish", lambda job: self.preview_server.publish(html_content),
+                                   lambda changed: None)
+        
+        def failed(e):
+            self.status.config(text=f"✗ {template} generation failed")
+            messagebox.showerror("Error", f"Failed to generate website: {str(e)}")
+        
+        self.runner.submit("generate", work, done, failed)
+    
+    def save_website(self):
+        if not hasattr(self, 'current_html'):
+            messagebox.showwarning("Warning", "Please generate a website first!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".html",
+            filetypes=[("HTML files", "*.html"), ("All files", "*.*")],
+            initialfile=f"{self.website_name.get().replace(' ', '_').lower()}.html"
+        )
+        
+        if file_path:
+            html_content = self.current_html
+            template = self.current_template
+            optimize = self.optimize_var.get()
+            self.status.config(text=f"⏳ Saving to {file_path}...")
+            
+            timings = instrument.begin("save")
+            
+            def work(job):
+                # A build manifest beside the file skips rewriting unchanged output
+                with timings.stage("manifest"):
+                    manifest = BuildManifest(os.path.dirname(file_path))
+                    previous = manifest.previous(file_path)
+                with timings.stage("write"):
+                    if not optimize:
+                        digest, size, written = write_text(job, file_path, html_content, previous=previous)
+                        savings, extra = "", ()
+                    else:
+                        stage = OutputStage(minify=True, gzip_level=DEFAULT_GZIP_LEVEL)
+                        sizes, digest, written = stage.write(file_path, html_content, template, previous)
+                        size = sizes[1]
+                        savings, extra = format_savings(stage.totals).strip(), (file_path + ".gz",)
+                    timings.add_bytes(size if written else 0)
+                with timings.stage("record"):
+                    manifest.record(file_path, digest, size, written, extra)
+                    manifest.save()
+                return file_path, savings, written
+            
+            def done(result):
+                path, savings, written = result
+                breakdown = timings.finish().summary()
+                if not written:
+                    self.status.config(text=f"✓ {path} is up to date, nothing written" +
+                                            (f" — {breakdown}" if breakdown else ""))
+                    return
+                self.status.config(text=f"✓ Website saved to {path}" + (f" — {savings}" if savings else "") +
+                                        (f" — {breakdown}" if breakdown else ""))
+                messagebox.showinfo("Success", f"Website saved successfully!\n{path}" +
+                                    (f"\n\n{savings}" if savings else ""))
+            
+            def failed(e):
+                self.status.config(text="✗ Save failed")
+                messagebox.showerror("Error", f"Failed to save file: {str(e)}")
+            
+            self.runner.submit("save", work, done, failed)
+    
+    def save_timings(self):
+        # Cumulative per-stage stats for this session as JSON
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile="timings.json"
+        )
+        if file_path:
+            instrument.recorder.dump(file_path)
+            self.status.config(text=f"✓ Timings saved to {file_path}")
+    
+    def export_zip(self):
+        # Bulk export: every site in a specs file, streamed into one archive
+        specs_path = filedialog.askopenfilename(
+            title="Choose site specs to export",
+            filetypes=[("Site specs", "*.jsonl *.csv"), ("JSON Lines", "*.jsonl"), ("CSV", "*.csv"),
+                       ("All files", "*.*")]
+        )
+        if not specs_path:
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".zip",
+            filetypes=[("ZIP archives", "*.zip"), ("All files", "*.*")],
+            initialfile="sites.zip"
+        )
+        if not file_path:
+            return
+        optimize = self.optimize_var.get()
+        self.status.config(text=f"⏳ Exporting to {file_path}...")
+        
+        def work(job):
+            import batch
+            import export
+            
+            def progress(stats):
+                job.check()
+                if stats["sites"] % 100 == 0:
+                    job.progress(f"⏳ Exporting... {stats['sites']} sites")
+            
+            stats = export.export_sites(batch.read_specs(specs_path), file_path, minify=optimize,
+                                        shared_css=optimize, progress=progress)
+            return export.format_report(stats, file_path)
+        
+        def done(report):
+            self.status.config(text=report.splitlines()[0])
+            messagebox.showinfo("Export complete", report)
+        
+        def failed(e):
+            self.status.config(text="✗ Export failed")
+            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+        
+        self.runner.submit("export", work, done, failed)
+    
+    def preview_in_browser(self):
+        if not hasattr(self, 'current_html'):
+            messagebox.showwarning("Warning", "Please generate a website first!")
+            return
+        
+        html_content = self.current_html
+        if self.preview_server is None:
+            self.preview_server = PreviewServer()
+        server = self.preview_server
+        self.status.config(text="⏳ Preparing browser preview...")
+        timings = instrument.begin("browser_preview")
+        
+        def work(job):
+            with timings.stage("publish"):
+                server.publish(html_content)
+                timings.add_bytes(len(html_content))
+            job.check()
+            # Pages already open reload themselves over server-sent events
+            if not server.clients:
+                with timings.stage("open_browser"):
+                    webbrowser.open(server.url)
+            return server.url
+        
+        def done(url):
+            breakdown = timings.finish().summary()
+            self.status.config(text=f"✓ Website previewed at {url}" + (f" — {breakdown}" if breakdown else ""))
+        
+        def failed(e):
+            self.status.config(text="✗ Browser preview failed")
+            messagebox.showerror("Error", f"Failed to open preview: {str(e)}")
+        
+        self.runner.submit("preview", work, done, failed)
+    
+    def show_gallery(self):
+        # The current spec in every template at once, side by side in the browser
+        timings = instrument.begin("gallery")
+        try:
+            with timings.stage("get_user_data"):
+                data = self.get_user_data()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+        if self.preview_server is None:
+            self.preview_server = PreviewServer()
+        if self.gallery is None:
+            self.gallery = Gallery(self.cache, self.templates)
+        server = self.preview_server
+        gallery = self.gallery
+        self.status.config(text=f"⏳ Rendering {len(gallery.names)} templates...")
+        
+        def work(job):
+            with timings.stage("render"):
+                pages, hits = gallery.render(data)
+                timings.add_bytes(sum(map(len, pages.values())))
+            job.check()
+            with timings.stage("publish"):
+                url = gallery.publish(server, data, pages)
+            # An open gallery reloads itself when any of its pages changed
+            if not server.watching(GALLERY_PATH):
+                with timings.stage("open_browser"):
+                    webbrowser.open(url)
+            return len(pages), len(hits)
+        
+        def done(result):
+            count, cached = result
+            breakdown = timings.finish().summary()
+            self.status.config(text=f"✓ Gallery of {count} templates ({cached} cached)" +
+                                    (f" — {breakdown}" if breakdown else ""))
+        
+        def failed(e):
+            self.status.config(text="✗ Gallery failed")
+            messagebox.showerror("Error", f"Failed to build the gallery: {str(e)}")
+        
+        self.runner.submit("gallery", work, done, failed)
+    
+    # Compatibility layer: rendering lives in the precompiled templates module
+    generate_business_template = staticmethod(templates.generate_business_template)
+    generate_portfolio_template = staticmethod(templates.generate_portfolio_template)
+    generate_ecommerce_template = staticmethod(templates.generate_ecommerce_template)
+    generate_blog_template = staticmethod(templates.generate_blog_template)
+    generate_landing_template = staticmethod(templates.generate_landing_template)
+    generate_restaurant_template = staticmethod(templates.generate_restaurant_template)
+
+
+def run():
+    root = tk.Tk()
+    WebsiteBuilder(root)
+    root.mainloop()
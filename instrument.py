@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Timings:
+    # Stage timings and byte counts for one operation, e.g. a Generate click
+    def __init__(self, recorder, operation):
+        self.recorder = recorder
+        self.operation = operation
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        entry = [name, 0.0, 0]
+        self.stages.append(entry)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            entry[1] = time.perf_counter() - start
+
+    def add_bytes(self, size):
+        # Counted against the latest stage, normally the one still open
+        if self.stages:
+            self.stages[-1][2] += size
+
+    def finish(self):
+        self.recorder.record(self.operation, self.stages)
+        return self
+
+    def summary(self):
+        parts = [f"{name} {seconds * 1e3:.1f} ms" for name, seconds, _ in self.stages]
+        size = sum(size for _, _, size in self.stages)
+        if size:
+            parts.append(f"{size / 1024:.1f} KB")
+        return " · ".join(parts)
+
+
+class NullTimings:
+    # Shared stand-in while instrumentation is off: every call is a no-op
+    stages = ()
+
+    def stage(self, name):
+        return NULL_STAGE
+
+    def add_bytes(self, size):
+        pass
+
+    def finish(self):
+        return self
+
+    def summary(self):
+        return ""
+
+
+class NullStage:
+    def __enter__(self):
+        return NULL_TIMINGS
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_TIMINGS = NullTimings()
+NULL_STAGE = NullStage()
+
+
+class Recorder:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.last = {}
+
+    def begin(self, operation):
+        return Timings(self, operation) if self.enabled else NULL_TIMINGS
+
+    def record(self, operation, stages):
+        with self.lock:
+            self.last[operation] = [tuple(stage) for stage in stages]
+            stats = self.totals.setdefault(operation, {})
+            for name, seconds, size in stages:
+                total = stats.setdefault(name, [0, 0.0, 0.0, 0])
+                total[0] += 1
+                total[1] += seconds
+                total[2] = max(total[2], seconds)
+                total[3] += size
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                operation: {
+                    name: {"count": count, "total_ms": seconds * 1e3, "mean_ms": seconds * 1e3 / count,
+                           "max_ms": longest * 1e3, "bytes": size}
+                    for name, (count, seconds, longest, size) in stages.items()
+                }
+                for operation, stages in self.totals.items()
+            }
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+recorder = Recorder()
+
+
+def enable(enabled=True):
+    recorder.enabled = enabled
+
+
+def begin(operation):
+    return recorder.begin(operation)
+
+
+@contextmanager
+def profiled(path, memory=False, top=30):
+    # cProfile stats go to path (read with pstats or snakeviz); with memory,
+    # the peak and top allocation sites go to path + ".memory.txt"
+    import cProfile
+    if memory:
+        import tracemalloc
+        tracemalloc.start()
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(path + ".memory.txt", 'w', encoding='utf-8') as f:
+                f.write(f"current {current / 1024:.1f} KB, peak {peak / 1024:.1f} KB\n\n")
+                for stat in snapshot.statistics("lineno")[:top]:
+                    f.write(f"{stat}\n")
+
+
+def format_report(snapshot):
+    lines = []
+    for operation, stages in snapshot.items():
+        lines.append(f"  {operation}:")
+        for name, stats in stages.items():
+            line = (f"    {name:<14} {stats['count']:>7}×  mean {stats['mean_ms']:8.3f} ms  "
+                    f"max {stats['max_ms']:8.3f} ms  total {stats['total_ms'] / 1e3:7.2f} s")
+            if stats["bytes"]:
+                line += f"  {stats['bytes'] / 1e6:.1f} MB"
+            lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,251 @@
+import json
+import os
+import time
+from datetime import datetime
+
+import templates
+from batch import normalize_spec, output_name, read_specs
+from stylesheet import shared_stylesheet
+from sync import BuildManifest, write_if_changed
+
+DEFAULT_LOCALE = "en"
+DATE_FORMAT = "@date_format"
+MONTHS = "@months"
+
+# English message -> translation. A message missing from a catalog falls
+# back to English; a catalog may also set a date format and month names.
+CATALOGS = {
+    "en": {},
+    "de": {
+        "Home": "Start", "Features": "Leistungen", "About": "Über uns", "Contact": "Kontakt",
+        "Welcome to": "Willkommen bei", "Get Started": "Jetzt starten", "About Us": "Über uns",
+        "We are committed to delivering excellence and exceeding expectations in everything we do.":
+            "Wir setzen uns für herausragende Qualität ein und übertreffen Erwartungen in allem, was wir tun.",
+        "Contact Us": "Kontakt", "Email:": "E-Mail:", "Phone:": "Telefon:", "Address:": "Adresse:",
+        "All rights reserved.": "Alle Rechte vorbehalten.", "Portfolio": "Portfolio",
+        "Skills & Expertise": "Fähigkeiten & Expertise", "Let's Work Together": "Lassen Sie uns zusammenarbeiten",
+        "Contact Me": "Kontakt aufnehmen", "Shop": "Shop", "Welcome to Our Store": "Willkommen in unserem Shop",
+        "Add to Cart": "In den Warenkorb", "Posted on": "Veröffentlicht am", "Read more →": "Weiterlesen →",
+        "← All posts": "← Alle Beiträge", "Get Started Now": "Jetzt loslegen", "Restaurant": "Restaurant",
+        "Reserve a Table": "Tisch reservieren", "Our Menu": "Unsere Speisekarte", "Chef's Special": "Empfehlung des Küchenchefs",
+        "Visit Us": "Besuchen Sie uns", "Reservations:": "Reservierungen:",
+        DATE_FORMAT: "{day}. {month} {year}",
+        MONTHS: ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August", "September",
+                 "Oktober", "November", "Dezember"]
+    },
+    "fr": {
+        "Home": "Accueil", "Features": "Services", "About": "À propos", "Contact": "Contact",
+        "Welcome to": "Bienvenue chez", "Get Started": "Commencer", "About Us": "À propos de nous",
+        "We are committed to delivering excellence and exceeding expectations in everything we do.":
+            "Nous nous engageons à viser l'excellence et à dépasser les attentes dans tout ce que nous faisons.",
+        "Contact Us": "Contactez-nous", "Email:": "E-mail :", "Phone:": "Téléphone :", "Address:": "Adresse :",
+        "All rights reserved.": "Tous droits réservés.", "Portfolio": "Portfolio",
+        "Skills & Expertise": "Compétences & expertise", "Let's Work Together": "Travaillons ensemble",
+        "Contact Me": "Me contacter", "Shop": "Boutique", "Welcome to Our Store": "Bienvenue dans notre boutique",
+        "Add to Cart": "Ajouter au panier", "Posted on": "Publié le", "Read more →": "Lire la suite →",
+        "← All posts": "← Tous les articles", "Get Started Now": "Commencez maintenant", "Restaurant": "Restaurant",
+        "Reserve a Table": "Réserver une table", "Our Menu": "Notre carte", "Chef's Special": "Suggestion du chef",
+        "Visit Us": "Rendez-nous visite", "Reservations:": "Réservations :",
+        DATE_FORMAT: "{day} {month} {year}",
+        MONTHS: ["janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août", "septembre",
+                 "octobre", "novembre", "décembre"]
+    },
+    "es": {
+        "Home": "Inicio", "Features": "Servicios", "About": "Nosotros", "Contact": "Contacto",
+        "Welcome to": "Bienvenido a", "Get Started": "Empezar", "About Us": "Sobre nosotros",
+        "We are committed to delivering excellence and exceeding expectations in everything we do.":
+            "Nos comprometemos a ofrecer excelencia y superar las expectativas en todo lo que hacemos.",
+        "Contact Us": "Contáctanos", "Email:": "Correo:", "Phone:": "Teléfono:", "Address:": "Dirección:",
+        "All rights reserved.": "Todos los derechos reservados.", "Portfolio": "Portafolio",
+        "Skills & Expertise": "Habilidades y experiencia", "Let's Work Together": "Trabajemos juntos",
+        "Contact Me": "Contáctame", "Shop": "Tienda", "Welcome to Our Store": "Bienvenido a nuestra tienda",
+        "Add to Cart": "Añadir al carrito", "Posted on": "Publicado el", "Read more →": "Leer más →",
+        "← All posts": "← Todas las entradas", "Get Started Now": "Empieza ahora", "Restaurant": "Restaurante",
+        "Reserve a Table": "Reservar mesa", "Our Menu": "Nuestro menú", "Chef's Special": "Especialidad del chef",
+        "Visit Us": "Visítanos", "Reservations:": "Reservas:",
+        DATE_FORMAT: "{day} de {month} de {year}",
+        MONTHS: ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre",
+                 "octubre", "noviembre", "diciembre"]
+    },
+    "it": {
+        "Home": "Home", "Features": "Servizi", "About": "Chi siamo", "Contact": "Contatti",
+        "Welcome to": "Benvenuti da", "Get Started": "Inizia", "About Us": "Chi siamo",
+        "We are committed to delivering excellence and exceeding expectations in everything we do.":
+            "Ci impegniamo a offrire l'eccellenza e a superare le aspettative in tutto ciò che facciamo.",
+        "Contact Us": "Contattaci", "Email:": "Email:", "Phone:": "Telefono:", "Address:": "Indirizzo:",
+        "All rights reserved.": "Tutti i diritti riservati.", "Portfolio": "Portfolio",
+        "Skills & Expertise": "Competenze ed esperienza", "Let's Work Together": "Lavoriamo insieme",
+        "Contact Me": "Contattami", "Shop": "Negozio", "Welcome to Our Store": "Benvenuti nel nostro negozio",
+        "Add to Cart": "Aggiungi al carrello", "Posted on": "Pubblicato il", "Read more →": "Leggi tutto →",
+        "← All posts": "← Tutti gli articoli", "Get Started Now": "Inizia ora", "Restaurant": "Ristorante",
+        "Reserve a Table": "Prenota un tavolo", "Our Menu": "Il nostro menù", "Chef's Special": "Specialità dello chef",
+        "Visit Us": "Vieni a trovarci", "Reservations:": "Prenotazioni:",
+        DATE_FORMAT: "{day} {month} {year}",
+        MONTHS: ["gennaio", "febbraio", "marzo", "aprile", "maggio", "giugno", "luglio", "agosto", "settembre",
+                 "ottobre", "novembre", "dicembre"]
+    },
+    "pt": {
+        "Home": "Início", "Features": "Serviços", "About": "Sobre", "Contact": "Contato",
+        "Welcome to": "Bem-vindo à", "Get Started": "Começar", "About Us": "Sobre nós",
+        "We are committed to delivering excellence and exceeding expectations in everything we do.":
+            "Temos o compromisso de oferecer excelência e superar expectativas em tudo o que fazemos.",
+        "Contact Us": "Fale conosco", "Email:": "E-mail:", "Phone:": "Telefone:", "Address:": "Endereço:",
+        "All rights reserved.": "Todos os direitos reservados.", "Portfolio": "Portfólio",
+        "Skills & Expertise": "Habilidades e experiência", "Let's Work Together": "Vamos trabalhar juntos",
+        "Contact Me": "Fale comigo", "Shop": "Loja", "Welcome to Our Store": "Bem-vindo à nossa loja",
+        "Add to Cart": "Adicionar ao carrinho", "Posted on": "Publicado em", "Read more →": "Leia mais →",
+        "← All posts": "← Todas as publicações", "Get Started Now": "Comece agora", "Restaurant": "Restaurante",
+        "Reserve a Table": "Reservar mesa", "Our Menu": "Nosso cardápio", "Chef's Special": "Especial do chef",
+        "Visit Us": "Visite-nos", "Reservations:": "Reservas:",
+        DATE_FORMAT: "{day} de {month} de {year}",
+        MONTHS: ["janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho", "agosto", "setembro",
+                 "outubro", "novembro", "dezembro"]
+    },
+    "nl": {
+        "Home": "Home", "Features": "Diensten", "About": "Over ons", "Contact": "Contact",
+        "Welcome to": "Welkom bij", "Get Started": "Aan de slag", "About Us": "Over ons",
+        "We are committed to delivering excellence and exceeding expectations in everything we do.":
+            "Wij streven naar uitmuntendheid en overtreffen verwachtingen in alles wat we doen.",
+        "Contact Us": "Neem contact op", "Email:": "E-mail:", "Phone:": "Telefoon:", "Address:": "Adres:",
+        "All rights reserved.": "Alle rechten voorbehouden.", "Portfolio": "Portfolio",
+        "Skills & Expertise": "Vaardigheden & expertise", "Let's Work Together": "Laten we samenwerken",
+        "Contact Me": "Neem contact op", "Shop": "Winkel", "Welcome to Our Store": "Welkom in onze winkel",
+        "Add to Cart": "In winkelwagen", "Posted on": "Geplaatst op", "Read more →": "Lees meer →",
+        "← All posts": "← Alle berichten", "Get Started Now": "Begin nu", "Restaurant": "Restaurant",
+        "Reserve a Table": "Reserveer een tafel", "Our Menu": "Ons menu", "Chef's Special": "Aanrader van de chef",
+        "Visit Us": "Bezoek ons", "Reservations:": "Reserveringen:",
+        DATE_FORMAT: "{day} {month} {year}",
+        MONTHS: ["januari", "februari", "maart", "april", "mei", "juni", "juli", "augustus", "september",
+                 "oktober", "november", "december"]
+    }
+}
+
+
+def load_catalogs(directory):
+    # <locale>.json files (English message -> translation) over the built-in ones
+    catalogs = {code: dict(messages) for code, messages in CATALOGS.items()}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                catalogs.setdefault(name[:-5], {}).update(json.load(f))
+    return catalogs
+
+
+def format_date(catalog, now):
+    if MONTHS not in catalog:
+        return now.strftime("%B %d, %Y")
+    return catalog.get(DATE_FORMAT, "{day} {month} {year}").format(
+        day=now.day, month=catalog[MONTHS][now.month - 1], year=now.year)
+
+
+def alternates_html(hrefs, default=DEFAULT_LOCALE):
+    # hrefs: locale -> URL of that locale's page; the same block goes on every one
+    links = [f'<link rel="alternate" hreflang="{code}" href="{href}">' for code, href in hrefs.items()]
+    if default in hrefs:
+        links.append(f'<link rel="alternate" hreflang="x-default" href="{hrefs[default]}">')
+    return "".join(f"    {link}\n" for link in links)
+
+
+class LocaleRenderer:
+    # Renders a spec once with every message marked, then splices each
+    # locale's strings into that one render. Everything locale independent
+    # (values, feature grids, the stylesheet) is built once per spec. A list
+    # whose items carry messages is translated per locale in its fragment
+    # and joined, so each extra locale costs two joins, not a lookup per item.
+    def __init__(self, locales, catalogs=CATALOGS, now=None):
+        unknown = [code for code in locales if code not in catalogs]
+        if unknown:
+            raise ValueError(f"no message catalog for {', '.join(unknown)}")
+        now = now or datetime.now()
+        self.locales = list(locales)
+        self.tables = {}
+        for code in self.locales:
+            catalog = catalogs[code]
+            table = {key: value for key, value in catalog.items() if isinstance(value, str)}
+            table[templates.LANG_MESSAGE] = code
+            table[templates.DATE_MESSAGE] = format_date(catalog, now)
+            self.tables[code] = table
+
+    def render(self, template, data, alternates="", sheet=None, prefix=""):
+        # Returns {locale: html}
+        if sheet is None:
+            page, build_values = templates.PAGES[template]
+            values = build_values(data, marked=True)
+        else:
+            page = sheet.page
+            values = sheet.values(data, prefix, marked=True)
+        parts = page.with_markers().render(values).split(templates.MARK)
+        if len(parts) % 2 == 0:
+            raise ValueError("spec text must not contain NUL characters")
+        messages = parts[1::2]
+        # The list is translated per locale as a whole (see LocalizedList)
+        localized = values.get(templates.LIST_MESSAGE)
+        at = 2 * messages.index(templates.LIST_MESSAGE) + 1 if localized is not None else None
+        pages = {}
+        for code in self.locales:
+            table = self.tables[code]
+            table[templates.ALTERNATES_MESSAGE] = alternates
+            parts[1::2] = [table.get(message, message) for message in messages]
+            if at is not None:
+                parts[at] = localized.render(table)
+                if templates.MARK in parts[at]:
+                    raise ValueError("spec text must not contain NUL characters")
+            pages[code] = "".join(parts)
+        parts = None
+        return pages
+
+
+def build_locales(spec_path, out_dir, locales, catalogs=CATALOGS, base_url="", shared_css=False, force=False):
+    # out_dir/<locale>/<name>.html for every spec, each page linking all of
+    # its translations through hreflang
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    renderer = LocaleRenderer(locales, catalogs)
+    manifest = BuildManifest(out_dir, force)
+    stats = {"sites": 0, "pages": 0, "bytes": 0, "unchanged": 0, "locales": len(locales), "errors": []}
+    sheets = {}
+    for code in locales:
+        os.makedirs(os.path.join(out_dir, code), exist_ok=True)
+    used = set()
+    for spec in read_specs(spec_path):
+        template = spec.get("template", "Business")
+        name = output_name(spec, used)
+        if template not in templates.TEMPLATES:
+            stats["errors"].append((name, f"unknown template '{template}'"))
+            continue
+        sheet = None
+        if shared_css:
+            sheet = sheets.get(template)
+            if sheet is None:
+                sheet = sheets[template] = shared_stylesheet(template)
+                for code in locales:
+                    new = not os.path.exists(os.path.join(out_dir, code, sheet.filename))
+                    manifest.add_asset(sheet.write(os.path.join(out_dir, code)), new)
+        hrefs = {code: f"{base_url}{code}/{name}" if base_url else f"../{code}/{name}" for code in locales}
+        try:
+            pages = renderer.render(template, normalize_spec(spec), alternates_html(hrefs, locales[0]), sheet)
+        except Exception as e:
+            stats["errors"].append((name, str(e)))
+            continue
+        for code, html_content in pages.items():
+            file_path = os.path.join(out_dir, code, name)
+            digest, size, written = write_if_changed(file_path, [html_content], manifest.previous(file_path))
+            manifest.record(file_path, digest, size, written)
+            stats["pages"] += 1
+            stats["bytes"] += size
+            stats["unchanged"] += not written
+        stats["sites"] += 1
+    manifest.prune()
+    manifest.save()
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def format_report(stats):
+    elapsed = stats["elapsed"] or 1e-9
+    report = (f"✓ Built {stats['sites']} sites × {stats['locales']} locales = {stats['pages']} pages "
+              f"({stats['bytes'] / 1e6:.1f} MB) in {stats['elapsed']:.2f}s — {stats['sites'] / elapsed:.1f} sites/sec, "
+              f"{stats['pages'] / elapsed:.1f} pages/sec ({stats['unchanged']} unchanged)")
+    for name, error in stats["errors"]:
+        report += f"\n✗ {name}: {error}"
+    return report
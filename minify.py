@@ -0,0 +1,99 @@
+import gzip
+import os
+import re
+from functools import lru_cache
+
+from sync import write_if_changed
+
+DEFAULT_GZIP_LEVEL = 9
+
+CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+CSS_SPACE = re.compile(r"\s+")
+CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+CSS_COLON = re.compile(r":\s+")
+
+HTML_RAW = re.compile(r"(<(pre|textarea|script|style)\b[^>]*>.*?</\2>)", re.S | re.I)
+HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+HTML_SPACE = re.compile(r"\s+")
+STYLE_BLOCK = re.compile(r"(<style\b[^>]*>)(.*?)(</style>)", re.S | re.I)
+
+
+@lru_cache(maxsize=1024)
+def minify_css(css):
+    # Memoized: sites sharing a template and color share the exact same block
+    parts = CSS_STRING.split(CSS_COMMENT.sub("", css))
+    for i in range(0, len(parts), 2):
+        text = CSS_SPACE.sub(" ", parts[i])
+        text = CSS_PUNCTUATION.sub(r"\1", text)
+        parts[i] = CSS_COLON.sub(":", text).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def minify_html(html_content):
+    parts = HTML_RAW.split(html_content)
+    out = []
+    # split() yields text, raw block, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        text = HTML_SPACE.sub(" ", HTML_COMMENT.sub("", parts[i]))
+        out.append(text)
+        if i + 1 < len(parts):
+            raw = parts[i + 1]
+            if parts[i + 2].lower() == "style":
+                raw = STYLE_BLOCK.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), raw)
+            out.append(raw)
+    return "".join(out).strip()
+
+
+class OutputStage:
+    # Post-render pipeline: optional minification, then the page plus an
+    # optional precompressed .gz sibling
+    def __init__(self, minify=True, gzip_level=None):
+        self.minify = minify
+        self.gzip_level = gzip_level
+        self.totals = {}
+
+    def write(self, file_path, html_content, template=None, previous=None):
+        # Returns (sizes, digest, written); previous is the build manifest
+        # entry, and an unchanged page keeps its file and .gz untouched
+        raw_size = len(html_content.encode("utf-8"))
+        if self.minify:
+            html_content = minify_html(html_content)
+        digest, size, written = write_if_changed(file_path, [html_content], previous)
+        gz_size = 0
+        if self.gzip_level is not None:
+            gz_path = file_path + ".gz"
+            if written or not os.path.exists(gz_path):
+                gz_size = write_gzip(gz_path, html_content.encode("utf-8"), self.gzip_level)
+            else:
+                gz_size = os.path.getsize(gz_path)
+        sizes = (raw_size, size, gz_size)
+        self.record(template, sizes)
+        return sizes, digest, written
+
+    def record(self, template, sizes):
+        total = self.totals.setdefault(template, [0, 0, 0, 0])
+        total[0] += 1
+        for i, size in enumerate(sizes, 1):
+            total[i] += size
+
+
+def write_gzip(file_path, data, level=DEFAULT_GZIP_LEVEL):
+    # mtime=0 keeps the archive bytes reproducible across builds
+    compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(compressed)
+    os.replace(temp_path, file_path)
+    return len(compressed)
+
+
+def format_savings(totals):
+    lines = []
+    for template, (count, raw, written, gz) in sorted(totals.items(), key=lambda item: str(item[0])):
+        line = (f"  {template or 'site'}: {count} page(s), {raw / 1024:.1f} KB → {written / 1024:.1f} KB "
+                f"({(raw - written) * 100 / raw if raw else 0:.0f}% smaller)")
+        if gz:
+            line += f", {gz / 1024:.1f} KB gzipped ({(raw - gz) * 100 / raw if raw else 0:.0f}% smaller)"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,66 @@
+import os
+
+BUFFER_SIZE = 64 * 1024
+
+
+class ChunkWriter:
+    # Buffers str chunks and sends encoded bytes once buffer_size is reached,
+    # so memory stays bounded no matter how long the document is
+    def __init__(self, raw, buffer_size=BUFFER_SIZE, encoding="utf-8", on_flush=None):
+        self.send = getattr(raw, "sendall", None) or raw.write
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.on_flush = on_flush
+        self.pending = []
+        self.pending_size = 0
+        self.bytes_written = 0
+
+    def write(self, chunk):
+        if len(chunk) > self.buffer_size:
+            self.flush()
+            for start in range(0, len(chunk), self.buffer_size):
+                self._send(chunk[start:start + self.buffer_size])
+            return
+        self.pending.append(chunk)
+        self.pending_size += len(chunk)
+        if self.pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self._send("".join(self.pending))
+            self.pending.clear()
+            self.pending_size = 0
+
+    def _send(self, text):
+        data = text.encode(self.encoding)
+        self.send(data)
+        self.bytes_written += len(data)
+        if self.on_flush:
+            self.on_flush(self.bytes_written)
+
+
+def stream_to(raw, chunks, buffer_size=BUFFER_SIZE, on_flush=None):
+    writer = ChunkWriter(raw, buffer_size, on_flush=on_flush)
+    for chunk in chunks:
+        writer.write(chunk)
+    writer.flush()
+    return writer.bytes_written
+
+
+def stream_to_file(file_path, chunks, buffer_size=BUFFER_SIZE, on_flush=None, atomic=True):
+    # Atomic writes go to a temp file renamed into place on success
+    if not atomic:
+        with open(file_path, 'wb') as f:
+            return stream_to(f, chunks, buffer_size, on_flush)
+
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            size = stream_to(f, chunks, buffer_size, on_flush)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return size
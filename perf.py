@@ -0,0 +1,236 @@
+import hashlib
+import re
+import textwrap
+import zlib
+from functools import lru_cache
+
+import audit
+import templates
+from minify import minify_css
+from stylesheet import HASH_LENGTH, STYLESHEET_LINK, SharedStylesheet, slugify, split_stylesheet
+
+# Items per block of a long list; the first block is live and the rest are
+# revealed as the visitor scrolls towards them
+BLOCK_ITEMS = 48
+# Template -> (list slot, item fragment, likely columns, row height in px),
+# used to cut the page at its list and to size blocks before they render
+PERF_LISTS = {
+    "Business": ("{features}", templates.BUSINESS_FEATURE, 3, 200),
+    "Portfolio": ("{features}", templates.PORTFOLIO_SKILL, 4, 110),
+    "E-commerce": ("{products}", templates.PRODUCT_CARD, 4, 330),
+    "Blog": ("{posts}", templates.BLOG_SUMMARY, 1, 260),
+    "Landing Page": ("{features}", templates.LANDING_FEATURE, 3, 200),
+    "Restaurant": ("{features}", templates.RESTAURANT_DISH, 3, 120)
+}
+# Deferred CSS smaller than this stays inline: an extra request and its
+# <link>s cost more than the bytes they would take off the first render
+DEFERRED_MIN = 1024
+# Rules only for these states can wait for the deferred stylesheet
+INTERACTIVE = re.compile(r":(?:hover|focus|focus-visible|focus-within|active)\b")
+# Keyframes named by an animation declaration
+ANIMATION = re.compile(r"animation(?:-name)?\s*:([^;}]*)")
+
+# A block takes the place of its list in the layout: it spans the whole
+# grid row and lays its items out with the list's own columns and gap.
+# Off-screen blocks skip layout and paint, sized by the estimate until
+# they have rendered once.
+BLOCK_CSS = ".perf-block{{display:inherit;grid-template-columns:inherit;gap:inherit;grid-column:1/-1;" \
+            "content-visibility:auto;contain-intrinsic-size:auto {height}px}}"
+
+DEFERRED_LINK = ('<link rel="stylesheet" href="{stylesheet}" media="print" onload="this.media=\'all\'">'
+                 '<noscript>' + STYLESHEET_LINK + '</noscript>')
+
+# Swaps each <template class="perf-later"> for its block once the block
+# before it comes near the viewport; everything is revealed for printing,
+# and at once where IntersectionObserver is missing
+REVEAL_SCRIPT = '''<script>(function () {
+  function reveal() {
+    var later = document.querySelector("template.perf-later");
+    if (!later) return null;
+    var block = later.content.firstElementChild;
+    later.replaceWith(later.content);
+    return block;
+  }
+  function revealAll() { while (reveal()); }
+  addEventListener("beforeprint", revealAll);
+  if (!("IntersectionObserver" in window)) return revealAll();
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (!entry.isIntersecting) return;
+      observer.unobserve(entry.target);
+      var next = reveal();
+      if (next) observer.observe(next);
+    });
+  }, {rootMargin: "0px 0px 1500px 0px"});
+  document.querySelectorAll(".perf-block").forEach(function (block) { observer.observe(block); });
+})();</script>
+'''
+
+
+def css_rules(css):
+    # Top-level (prelude, body) pairs; bodies of @media and the like still
+    # hold their nested rules
+    rules = []
+    depth = 0
+    position = 0
+    prelude = ""
+    css = audit.CSS_COMMENT.sub("", css)
+    for match in audit.CSS_BRACE.finditer(css):
+        if match.group() == "{":
+            if depth == 0:
+                prelude = css[position:match.start()].rsplit(";", 1)[-1].strip()
+                position = match.end()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[position:match.start()]))
+                position = match.end()
+    return rules
+
+
+def split_critical(css, seen):
+    # (critical, deferred) css. A rule is critical when one of its selectors
+    # can match the markup in seen (ids, classes, tags) and is not only for
+    # hover or focus; @keyframes are critical when a critical rule animates
+    # with them, and @font-face is deferred
+    critical = []
+    deferred = []
+    keyframes = []
+    for prelude, body in css_rules(css):
+        if prelude.startswith("@"):
+            at_rule = prelude[1:].split(None, 1)[0].lower()
+            if at_rule.endswith("keyframes"):
+                keyframes.append((prelude.split(None, 1)[-1], f"{prelude} {{{body}}}"))
+            elif at_rule in audit.GROUPING_RULES:
+                # The nested rules keep their indentation, so it is removed
+                # before the group's own is added back
+                inner = split_critical(textwrap.dedent(body), seen)
+                for part, out in zip(inner, (critical, deferred)):
+                    if part:
+                        out.append(f"{prelude} {{\n{textwrap.indent(part, '    ')}\n}}")
+            else:
+                deferred.append(f"{prelude} {{{body}}}")
+            continue
+        rule = f"{prelude} {{{body}}}"
+        selectors = [s.strip() for s in prelude.split(",") if s.strip()]
+        if any(not INTERACTIVE.search(s) and _matches(audit.selector_parts(s), seen) for s in selectors):
+            critical.append(rule)
+        else:
+            deferred.append(rule)
+    # Deferring these would start the first screen's animations late
+    animated = set(re.findall(r"[\w-]+", " ".join(ANIMATION.findall("\n".join(critical)))))
+    for name, rule in keyframes:
+        (critical if name in animated else deferred).append(rule)
+    return "\n".join(critical), "\n".join(deferred)
+
+
+def _matches(parts, seen):
+    return all(needed <= have for needed, have in zip(parts, seen))
+
+
+def above_fold(page_source, slot, item_source):
+    # (ids, classes, tags) of the page up to its list plus one list item,
+    # which is what the first screen can show
+    cut = page_source.index(slot)
+    auditor = audit.PageAuditor()
+    auditor.feed(page_source[:cut] + item_source + '<div class="perf-block"></div>')
+    auditor.close()
+    return auditor.ids, auditor.classes, auditor.tags
+
+
+def _literal(text):
+    # Text placed into a template source, with its braces escaped
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class PerfStylesheet(SharedStylesheet):
+    # A template's page for fast first render: CSS for what the first screen
+    # shows is inline, the rest is a shared file loaded without blocking
+    # (unless under DEFERRED_MIN, when it is inline too), and its list is
+    # split into blocks of BLOCK_ITEMS revealed on scroll
+    def __init__(self, name, minify=False):
+        page, self.build_values = templates.PAGES[name]
+        slot, item, columns, row_height = PERF_LISTS[name]
+        css, page_source = split_stylesheet(page.source)
+        seen = above_fold(page.source, slot, item.source)
+        critical, deferred = split_critical(textwrap.dedent(css), seen)
+        if len(deferred) < DEFERRED_MIN:
+            critical, deferred = (critical + "\n" + deferred).strip(), ""
+        rows = -(-BLOCK_ITEMS // columns)
+        critical += "\n" + BLOCK_CSS.format(height=rows * row_height)
+        if minify:
+            critical, deferred = minify_css(critical), minify_css(deferred)
+        else:
+            critical = "\n" + textwrap.indent(critical, "        ") + "\n    "
+            deferred = deferred + "\n" if deferred else ""
+        self.critical = critical
+        self.css = deferred
+        # The name also tells the render cache this page apart, so it is set
+        # even when there is no file to write
+        digest = hashlib.sha256((critical + deferred).encode("utf-8")).hexdigest()[:HASH_LENGTH]
+        self.filename = f"{slugify(name)}-deferred.{digest}.css"
+        inline = "<style>" + _literal(critical) + "</style>"
+        if deferred:
+            inline += "\n    " + DEFERRED_LINK
+        page_source = page_source.replace(STYLESHEET_LINK, inline, 1)
+        page_source = page_source.replace("</body>", "    " + _literal(REVEAL_SCRIPT) + "</body>", 1)
+        self.page = templates.compile_template(page_source)
+
+    def values(self, data, prefix="", stream=False, **options):
+        options.setdefault("block_size", BLOCK_ITEMS)
+        return super().values(data, prefix, stream, **options)
+
+    def write(self, out_dir, gzip_level=None):
+        # None when all of the CSS is inline
+        return super().write(out_dir, gzip_level) if self.css else None
+
+
+def list_length(name, data):
+    # Items in the template's list, counted as its values function finds
+    # them; data may be a raw spec, so features can still be one string
+    slot = PERF_LISTS[name][0]
+    if slot == "{features}":
+        features = data.get("features") or []
+        return len(features.split(",")) if isinstance(features, str) else len(features)
+    items = data.get(slot[1:-1])
+    if items is None:
+        items = templates.SAMPLE_PRODUCTS if slot == "{products}" else templates.SAMPLE_POSTS
+    return len(items)
+
+
+def long_list(name, data):
+    # Only a list past its first block gains from the perf page; shorter
+    # pages would just pay for the extra request and script
+    return name in PERF_LISTS and list_length(name, data) > BLOCK_ITEMS
+
+
+@lru_cache(maxsize=None)
+def perf_stylesheet(name, minify=False):
+    return PerfStylesheet(name, minify)
+
+
+def page_metrics(page, deferred=""):
+    # What a visitor's browser pays for one page: bytes, gzip transfer
+    # (page plus any deferred sheet), the <head> that must arrive before
+    # anything paints, render-blocking CSS, and elements in the live DOM
+    metrics = audit.audit_chunks([page])["metrics"]
+    head = page[:page.index("<body")].encode("utf-8")
+    transfer = metrics["transfer"]
+    if deferred:
+        transfer += len(zlib.compress(deferred.encode("utf-8"), audit.TRANSFER_LEVEL)) + 18
+    return {"html": metrics["html"], "transfer": transfer, "head": len(head),
+            "blocking_css": metrics["css"], "nodes": metrics["nodes"], "depth": metrics["depth"]}
+
+
+def compare(template, data):
+    # Before/after metrics of the normal and perf pages for one spec
+    sheet = perf_stylesheet(template)
+    return {"before": page_metrics(templates.TEMPLATES[template](data)),
+            "after": page_metrics(sheet.render(data), sheet.css)}
+
+
+def format_compare(result):
+    before, after = result["before"], result["after"]
+    return "  ".join(f"{key} {before[key]:,}→{after[key]:,}" for key in ("nodes", "head", "blocking_css",
+                                                                         "transfer"))
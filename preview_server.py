@@ -0,0 +1,151 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+EVENTS_PATH = "/__events"
+HEARTBEAT_SECONDS = 15
+
+RELOAD_SCRIPT = '''<script>
+(function () {{
+    var source = new EventSource("{events}?path=" + encodeURIComponent(location.pathname));
+    source.addEventListener("reload", function (event) {{
+        if (event.data !== {etag}) {{ location.reload(); }}
+    }});
+}})();
+</script>
+'''
+
+
+class Document:
+    def __init__(self, html_content, live=True):
+        self.etag = '"' + hashlib.sha1(html_content.encode("utf-8")).hexdigest()[:16] + '"'
+        if not live:
+            self.body = html_content.encode("utf-8")
+            return
+        script = RELOAD_SCRIPT.format(events=EVENTS_PATH, etag=repr(self.etag))
+        index = html_content.rfind("</body>")
+        if index == -1:
+            index = len(html_content)
+        self.body = (html_content[:index] + script + html_content[index:]).encode("utf-8")
+
+
+class PreviewServer:
+    # Serves renders from memory on localhost; open pages reload over
+    # server-sent events when publish() swaps in a different document
+    def __init__(self, host="127.0.0.1", port=0):
+        self.documents = {}
+        self.version = 0
+        self.clients = 0
+        # Open event streams per page path
+        self.listeners = {}
+        self.closed = False
+        self.changed = threading.Condition()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="preview-server", daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def publish(self, html_content, path="/", live=True):
+        # live pages reload themselves when a different document is published
+        document = Document(html_content, live)
+        with self.changed:
+            current = self.documents.get(path)
+            if current is not None and current.etag == document.etag:
+                return False
+            self.documents[path] = document
+            self.version += 1
+            self.changed.notify_all()
+        return True
+
+    def watching(self, path):
+        # True while some open page at path listens for reloads
+        with self.changed:
+            return self.listeners.get(path, 0) > 0
+
+    def close(self):
+        with self.changed:
+            self.closed = True
+            self.changed.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == EVENTS_PATH:
+                    server._stream_events(self, parse_qs(url.query).get("path", ["/"])[0])
+                else:
+                    server._serve_document(self, url.path)
+
+            do_HEAD = do_GET
+
+        return Handler
+
+    def _serve_document(self, handler, path):
+        with self.changed:
+            document = self.documents.get(path)
+        if document is None:
+            handler.send_error(404)
+            return
+        if handler.headers.get("If-None-Match") == document.etag:
+            handler.send_response(304)
+            handler.send_header("ETag", document.etag)
+            handler.end_headers()
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(document.body)))
+        handler.send_header("ETag", document.etag)
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(document.body)
+
+    def _stream_events(self, handler, path):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+        # The first event carries the current ETag so a page that loaded just
+        # before a publish still catches up
+        with self.changed:
+            self.clients += 1
+            self.listeners[path] = self.listeners.get(path, 0) + 1
+        seen = None
+        try:
+            while True:
+                with self.changed:
+                    if not self.closed and self.version == seen:
+                        self.changed.wait(HEARTBEAT_SECONDS)
+                    if self.closed:
+                        return
+                    version = self.version
+                    document = self.documents.get(path)
+                if version == seen or document is None:
+                    handler.wfile.write(b": keep-alive\n\n")
+                else:
+                    seen = version
+                    handler.wfile.write(f"event: reload\ndata: {document.etag}\n\n".encode("utf-8"))
+                handler.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            with self.changed:
+                self.clients -= 1
+                self.listeners[path] -= 1
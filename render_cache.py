@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from templates import TEMPLATES, TEMPLATE_VERSION
+
+# Templates that stamp the full build date rather than just the year
+DATE_STAMPED_TEMPLATES = {"Blog"}
+
+
+def normalize_data(data):
+    social = data.get("social") or {}
+    return {
+        "name": data.get("name", ""),
+        "description": data.get("description", ""),
+        "email": data.get("email", ""),
+        "phone": data.get("phone", ""),
+        "color": data.get("color", ""),
+        "features": list(data.get("features", [])),
+        "social": {key: social.get(key, "") for key in ("facebook", "twitter", "linkedin")},
+        "products": data.get("products"),
+        "posts": data.get("posts")
+    }
+
+
+def build_stamp(template, now=None):
+    now = now or datetime.now()
+    if template in DATE_STAMPED_TEMPLATES:
+        return now.strftime("%Y-%m-%d")
+    return str(now.year)
+
+
+def spec_key(template, data, version=TEMPLATE_VERSION, stamp=None, variant=None):
+    # variant names an alternative layout of the same template (e.g. the
+    # shared stylesheet it links to); omitted so plain keys stay unchanged
+    parts = [template, normalize_data(data), version, stamp or build_stamp(template)]
+    if variant is not None:
+        parts.append(variant)
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    def __init__(self, maxsize=256, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_writes = 0
+
+    def render(self, template, data, render_fn=None, variant=None):
+        key = spec_key(template, data, variant=variant)
+        html_content = self.get(key)
+        if html_content is not None:
+            return html_content, True
+        html_content = (render_fn or TEMPLATES[template])(data)
+        self.put(key, html_content)
+        return html_content, False
+
+    def get(self, key):
+        with self.lock:
+            html_content = self.entries.get(key)
+            if html_content is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return html_content
+
+        html_content = self._read_disk(key)
+        with self.lock:
+            if html_content is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, html_content)
+        return html_content
+
+    def put(self, key, html_content):
+        with self.lock:
+            self._store(key, html_content)
+        self._write_disk(key, html_content)
+
+    def _store(self, key, html_content):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self.entries[key] = html_content
+        self.size += len(html_content)
+        while self.entries and (len(self.entries) > self.maxsize or self.size > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], key + ".html")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, html_content):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        os.replace(temp_path, path)
+        with self.lock:
+            self.disk_writes += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+                "disk_writes": self.disk_writes,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,282 @@
+import http.client
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from batch import normalize_spec
+from site_spec import SiteSpec
+from templates import TEMPLATES
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 64
+MAX_BODY = 1024 * 1024
+RENDER_TIMEOUT = 30
+# Idle keep-alive connections are closed after this many seconds
+IDLE_TIMEOUT = 30
+LATENCY_SAMPLES = 10000
+PERCENTILES = (50, 90, 99)
+# Pending connections the listening socket holds (socketserver defaults to 5)
+LISTEN_BACKLOG = 128
+
+
+def render_spec(template, spec):
+    return TEMPLATES[template](normalize_spec(spec))
+
+
+def percentiles(samples, points=PERCENTILES):
+    # Nearest-rank percentiles in milliseconds
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    return {f"p{p}": ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] * 1e3
+            for p in points}
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.statuses = {}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, status, seconds):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 200:
+                self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            statuses = dict(self.statuses)
+            latencies = list(self.latencies)
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": sum(statuses.values()),
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            "latency_ms": dict(percentiles(latencies), samples=len(latencies),
+                               max=max(latencies) * 1e3 if latencies else None)
+        }
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class RenderService:
+    # POST /render with a site spec (the GUI's fields plus "template") returns
+    # the page. At most workers + queue_size renders are admitted at once;
+    # past that requests get 429 instead of queueing without bound.
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, workers=None, queue_size=DEFAULT_QUEUE_SIZE):
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.queue_size = queue_size
+        if self.workers:
+            from concurrent.futures import ProcessPoolExecutor
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            # Start the workers before binding, so they neither inherit the
+            # listening socket nor slow down the first request
+            self.executor.submit(render_spec, "Business", {}).result()
+        else:
+            # workers=0 renders on a small thread pool inside the server process
+            self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="render")
+        self.slots = threading.BoundedSemaphore(max(1, self.workers) + queue_size)
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.metrics = Metrics()
+        self.httpd = Server((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="render-service", daemon=True)
+        self.thread.start()
+        return self
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+        self.httpd.server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        snapshot = self.metrics.snapshot()
+        with self.lock:
+            snapshot["in_flight"] = self.in_flight
+        snapshot["capacity"] = max(1, self.workers) + self.queue_size
+        snapshot["workers"] = self.workers
+        return snapshot
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            timeout = IDLE_TIMEOUT
+            # Headers and body go out as separate writes; with Nagle on,
+            # keep-alive clients wait out a delayed ACK on every response
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                if path == "/metrics":
+                    service._send_json(self, 200, service.stats())
+                elif path == "/health":
+                    service._send_json(self, 200, {"status": "ok"})
+                else:
+                    service._send_json(self, 404, {"error": "not found"})
+
+            def do_POST(self):
+                service._render(self, time.perf_counter())
+
+        return Handler
+
+    def _render(self, handler, start):
+        # The body is always read in full so the keep-alive connection stays in sync
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            handler.close_connection = True
+            return self._finish(handler, start, 413, {"error": f"body over {MAX_BODY} bytes"})
+        body = handler.rfile.read(length)
+        if urlsplit(handler.path).path != "/render":
+            return self._finish(handler, start, 404, {"error": "not found"})
+        try:
+            spec = json.loads(body)
+        except ValueError as e:
+            return self._finish(handler, start, 400, {"error": f"invalid JSON: {e}"})
+        if not isinstance(spec, dict):
+            return self._finish(handler, start, 400, {"error": "spec must be a JSON object"})
+        template = spec.get("template", "Business")
+        if template not in TEMPLATES:
+            return self._finish(handler, start, 400, {"error": f"unknown template '{template}'"})
+        try:
+            # Checked here, so a bad spec is the client's 400 rather than a
+            # worker's 500
+            SiteSpec.from_dict(normalize_spec(spec))
+        except (ValueError, TypeError, AttributeError) as e:
+            return self._finish(handler, start, 400, {"error": f"invalid spec: {e}"})
+
+        if not self.slots.acquire(blocking=False):
+            return self._finish(handler, start, 429, {"error": "render queue full"}, {"Retry-After": "1"})
+        with self.lock:
+            self.in_flight += 1
+        try:
+            future = self.executor.submit(render_spec, template, spec)
+        except Exception as e:
+            self._release()
+            return self._finish(handler, start, 500, {"error": str(e) or type(e).__name__})
+        # The slot is held until the render finishes, even when this request
+        # has given up on it, so timed-out renders still count against capacity
+        future.add_done_callback(self._release)
+        try:
+            html_content = future.result(RENDER_TIMEOUT)
+        except Exception as e:
+            return self._finish(handler, start, 500, {"error": str(e) or type(e).__name__})
+
+        data = html_content.encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+        self.metrics.record(200, time.perf_counter() - start)
+
+    def _release(self, future=None):
+        with self.lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+    def _finish(self, handler, start, status, payload, headers=None):
+        self._send_json(handler, status, payload, headers)
+        self.metrics.record(status, time.perf_counter() - start)
+
+    def _send_json(self, handler, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def load_test(url, spec, requests=1000, concurrency=8):
+    # Keep-alive clients, one connection per thread, sharing a request budget
+    target = urlsplit(url)
+    body = json.dumps(spec).encode("utf-8")
+    remaining = [requests]
+    lock = threading.Lock()
+    statuses = {}
+    latencies = []
+
+    def client():
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=RENDER_TIMEOUT)
+        local = []
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        break
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    connection.request("POST", "/render", body, {"Content-Type": "application/json"})
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException):
+                    # Counted as a failure; the next request reconnects
+                    connection.close()
+                    status = "error"
+                local.append((status, time.perf_counter() - start))
+        finally:
+            connection.close()
+            with lock:
+                for status, seconds in local:
+                    statuses[status] = statuses.get(status, 0) + 1
+                    if status == 200:
+                        latencies.append(seconds)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "requests_per_sec": requests / elapsed if elapsed else 0.0,
+        "statuses": statuses,
+        "latency_ms": percentiles(latencies)
+    }
+
+
+def format_load_report(stats):
+    latency = stats["latency_ms"]
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats["statuses"].items(), key=str))
+    line = (f"✓ {stats['requests']} requests at concurrency {stats['concurrency']} in {stats['elapsed']:.2f}s "
+            f"— {stats['requests_per_sec']:.0f} req/s ({statuses})")
+    if latency["p50"] is not None:
+        line += "\n  latency " + ", ".join(f"{name} {value:.1f} ms" for name, value in latency.items())
+    return line
@@ -0,0 +1,245 @@
+import html
+import json
+import os
+import re
+import shutil
+import tempfile
+from array import array
+
+from output import stream_to_file
+
+INDEX_DIR = "search"
+INDEX_VERSION = 1
+# Terms are sharded on their first PREFIX_LENGTH characters; the browser
+# fetches only the shard for what is being typed
+PREFIX_LENGTH = 2
+MIN_TERM = 2
+MAX_TERM = 24
+# Documents (url, title, note) go out in fixed-size chunks, fetched for the
+# results actually shown
+DOCS_PER_CHUNK = 500
+# Postings held in memory before they spill to per-shard run files
+MEMORY_BUDGET = 32 * 1024 * 1024
+# Rough cost of one term entry: dict slot, str and array headers
+TERM_OVERHEAD = 200
+RESULT_LIMIT = 20
+
+TERM = re.compile(r"\w+")
+PLAIN_KEY = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("an and are as at be by for from in is it of on or our the this to was with you your".split())
+
+SEARCH_WIDGET = '''
+    <div class="site-search" style="max-width: 800px; margin: 1.5rem auto 0; padding: 0 2rem;">
+        <input type="search" id="site-search" placeholder="Search…" aria-label="Search" autocomplete="off" style="width: 100%; padding: 0.6rem 1rem; font-size: 1rem; border: 1px solid #ccc; border-radius: 6px;">
+        <ol id="site-search-results" style="list-style: none; margin-top: 0.5rem;"></ol>
+    </div>
+    <script src="{root}search/search.js" data-root="{root}" defer></script>'''
+
+# Kept in step with terms() and shard_key() below
+SEARCH_SCRIPT = '''(function () {
+  var script = document.currentScript, root = script.dataset.root, base = root + "search/";
+  var input = document.getElementById("site-search"), list = document.getElementById("site-search-results");
+  var meta = null, cache = {}, timer = null;
+  function get(path) {
+    if (!cache[path]) cache[path] = fetch(base + path).then(function (r) { return r.ok ? r.json() : {}; });
+    return cache[path];
+  }
+  function shardKey(term) {
+    var prefix = Array.from(term).slice(0, meta.prefix).join("");
+    if (/^[a-z0-9]+$/.test(prefix)) return prefix;
+    return "_" + Array.from(new TextEncoder().encode(prefix), function (b) {
+      return b.toString(16).padStart(2, "0");
+    }).join("");
+  }
+  function lookup(term, prefix) {
+    var key = shardKey(term);
+    if (meta.shards.indexOf(key) < 0) return Promise.resolve(new Set());
+    return get("shards/" + key + ".json").then(function (shard) {
+      var ids = new Set();
+      Object.keys(shard).forEach(function (t) {
+        if (t !== term && !(prefix && t.startsWith(term))) return;
+        for (var i = 0, id = 0; i < shard[t].length; i++) ids.add(id += shard[t][i]);
+      });
+      return ids;
+    });
+  }
+  function show(query, docs) {
+    if (input.value !== query) return;
+    list.textContent = "";
+    docs.forEach(function (doc) {
+      var item = document.createElement("li"), link = document.createElement("a");
+      link.href = root + doc[0];
+      link.textContent = doc[2] ? doc[1] + " — " + doc[2] : doc[1];
+      item.appendChild(link);
+      list.appendChild(item);
+    });
+  }
+  function search(query) {
+    var terms = (query.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || []).filter(function (t) {
+      var length = Array.from(t).length;
+      return length >= meta.min && length <= meta.max && meta.stopwords.indexOf(t) < 0;
+    });
+    if (!terms.length) return show(query, []);
+    Promise.all(terms.map(function (t, i) { return lookup(t, i === terms.length - 1); })).then(function (sets) {
+      var ids = Array.from(sets[0]).filter(function (id) {
+        return sets.every(function (s) { return s.has(id); });
+      }).sort(function (a, b) { return a - b; }).slice(0, meta.limit);
+      return Promise.all(ids.map(function (id) {
+        var chunk = Math.floor(id / meta.chunk);
+        return get("docs/" + chunk + ".json").then(function (docs) { return docs[id - chunk * meta.chunk]; });
+      }));
+    }).then(function (docs) { show(query, docs); });
+  }
+  input.addEventListener("input", function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () {
+      get("meta.json").then(function (m) { meta = m; search(input.value); });
+    }, 120);
+  });
+})();
+'''
+
+
+def terms(text):
+    # Distinct index terms of a piece of (possibly escaped) text
+    return {term for term in TERM.findall(html.unescape(text).lower())
+            if MIN_TERM <= len(term) <= MAX_TERM and term not in STOPWORDS}
+
+
+def shard_key(term):
+    # File-name-safe shard name: the prefix itself, or its UTF-8 bytes in hex
+    prefix = term[:PREFIX_LENGTH]
+    if PLAIN_KEY.fullmatch(prefix):
+        return prefix
+    return "_" + prefix.encode("utf-8").hex()
+
+
+def search_widget(root=""):
+    # The search box and script tag for a page root/ below the site root
+    return SEARCH_WIDGET.replace("{root}", root)
+
+
+def encode_postings(ids):
+    # Ascending doc ids as gaps, which stay small and compress well
+    previous = 0
+    gaps = []
+    for doc_id in ids:
+        gaps.append(doc_id - previous)
+        previous = doc_id
+    return gaps
+
+
+class SearchIndexBuilder:
+    # Streaming inverted index. add() documents in display order; postings
+    # live in compact int arrays until memory_budget is reached, then spill
+    # to one run file per shard. Doc ids only grow, so a shard's runs merge by
+    # concatenation in finish(), one shard in memory at a time.
+    def __init__(self, out_dir, memory_budget=MEMORY_BUDGET):
+        self.dir = os.path.join(out_dir, INDEX_DIR)
+        self.memory_budget = memory_budget
+        os.makedirs(os.path.join(self.dir, "shards"), exist_ok=True)
+        os.makedirs(os.path.join(self.dir, "docs"), exist_ok=True)
+        self.temp_dir = None
+        self.postings = {}
+        self.size = 0
+        self.docs = []
+        self.count = 0
+        self.spills = 0
+        self.spilled = set()
+
+    def add(self, url, title, text="", note=""):
+        doc_id = self.count
+        self.count += 1
+        self.docs.append([url, html.unescape(title), html.unescape(note)] if note else [url, html.unescape(title)])
+        if len(self.docs) == DOCS_PER_CHUNK:
+            self._write_docs()
+        postings = self.postings
+        for term in terms(f"{title} {text}"):
+            ids = postings.get(term)
+            if ids is None:
+                ids = postings[term] = array("I")
+                self.size += TERM_OVERHEAD + len(term)
+            ids.append(doc_id)
+            self.size += ids.itemsize
+        if self.size > self.memory_budget:
+            self._spill()
+
+    def _write_docs(self):
+        chunk = (self.count - 1) // DOCS_PER_CHUNK
+        file_path = os.path.join(self.dir, "docs", f"{chunk}.json")
+        stream_to_file(file_path, [json.dumps(self.docs, ensure_ascii=False, separators=(",", ":"))])
+        self.docs = []
+
+    def _spill(self):
+        # One "term<TAB>id id ..." line per term, appended to its shard's run
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix=".search-", dir=self.dir)
+        by_shard = {}
+        for term, ids in self.postings.items():
+            by_shard.setdefault(shard_key(term), []).append(f"{term}\t{' '.join(map(str, ids))}\n")
+        for key, lines in by_shard.items():
+            with open(os.path.join(self.temp_dir, key), 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        self.spilled.update(by_shard)
+        self.spills += 1
+        self.postings = {}
+        self.size = 0
+
+    def _shards(self):
+        # (key, {term: ids}) per shard, from memory or from the spilled runs
+        if self.temp_dir is None:
+            by_shard = {}
+            for term, ids in self.postings.items():
+                by_shard.setdefault(shard_key(term), {})[term] = ids
+            self.postings = {}
+            yield from sorted(by_shard.items())
+            return
+        self._spill()
+        for key in sorted(self.spilled):
+            shard = {}
+            with open(os.path.join(self.temp_dir, key), 'r', encoding='utf-8') as f:
+                for line in f:
+                    term, _, ids = line.rstrip("\n").partition("\t")
+                    shard.setdefault(term, array("I")).extend(map(int, ids.split()))
+            yield key, shard
+
+    def finish(self):
+        try:
+            if self.docs:
+                self._write_docs()
+            keys = []
+            size = 0
+            for key, shard in self._shards():
+                body = {term: encode_postings(shard[term]) for term in sorted(shard)}
+                size += stream_to_file(os.path.join(self.dir, "shards", f"{key}.json"),
+                                       [json.dumps(body, ensure_ascii=False, separators=(",", ":"))])
+                keys.append(key)
+        finally:
+            self.close()
+        chunks = -(-self.count // DOCS_PER_CHUNK)
+        self._remove_stale("shards", {f"{key}.json" for key in keys})
+        self._remove_stale("docs", {f"{n}.json" for n in range(chunks)})
+        meta = {"version": INDEX_VERSION, "docs": self.count, "chunk": DOCS_PER_CHUNK, "prefix": PREFIX_LENGTH,
+                "min": MIN_TERM, "max": MAX_TERM, "limit": RESULT_LIMIT, "stopwords": sorted(STOPWORDS),
+                "shards": keys}
+        stream_to_file(os.path.join(self.dir, "meta.json"), [json.dumps(meta, separators=(",", ":"))])
+        stream_to_file(os.path.join(self.dir, "search.js"), [SEARCH_SCRIPT])
+        return {"documents": self.count, "shards": len(keys), "shard_bytes": size, "spills": self.spills}
+
+    def _remove_stale(self, folder, keep):
+        # Shards and chunks left over from a larger earlier index
+        with os.scandir(os.path.join(self.dir, folder)) as entries:
+            for entry in entries:
+                if entry.name not in keep:
+                    os.remove(entry.path)
+
+    def close(self):
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+
+
+def format_report(stats):
+    return (f"  search index: {stats['documents']} documents in {stats['shards']} shards "
+            f"({stats['shard_bytes'] / 1e6:.1f} MB)" +
+            (f", {stats['spills']} spills to disk" if stats["spills"] else ""))
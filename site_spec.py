@@ -0,0 +1,177 @@
+import csv
+import json
+import re
+from operator import attrgetter
+
+HEX_COLOR = re.compile(r"#[0-9a-fA-F]{6}")
+SOCIAL_COLUMNS = ("facebook", "twitter", "linkedin")
+SPEC_FIELDS = ("template", "slug", "name", "description", "email", "phone", "color", "features", "social")
+NON_TEXT_FIELDS = {"slug", "features", "social"}
+
+
+def _restore(cls, values):
+    # Builds a record from already validated values, skipping __init__
+    record = object.__new__(cls)
+    for name, value in zip(cls.__slots__, values):
+        object.__setattr__(record, name, value)
+    return record
+
+
+class Record:
+    # Immutable, hashable record with __slots__ and no per-instance dict.
+    # keys() and [] make it read like the dicts the templates were written
+    # for, so either can be passed to a template.
+    __slots__ = ()
+
+    def __init_subclass__(cls):
+        # Plain class attribute, called as record.fields(record)
+        cls.fields = attrgetter(*cls.__slots__)
+
+    def values(self):
+        return self.fields(self)
+
+    def keys(self):
+        return self.__slots__
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    __delattr__ = __setattr__
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.values() == other.values()
+
+    def __hash__(self):
+        return hash(self.values())
+
+    def __reduce__(self):
+        return _restore, (type(self), self.values())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Social(Record):
+    __slots__ = SOCIAL_COLUMNS
+
+    def __init__(self, facebook="", twitter="", linkedin=""):
+        for name, value in zip(self.__slots__, (facebook, twitter, linkedin)):
+            if type(value) is not str:
+                raise ValueError(f"{name} must be a string, got {type(value).__name__}")
+            object.__setattr__(self, name, value)
+
+
+class SiteSpec(Record):
+    # One site: the form fields plus the template and an optional output slug.
+    # Values are checked here once, so renders and cache keys can trust them.
+    __slots__ = SPEC_FIELDS
+
+    def __init__(self, name="My Awesome Website", description="", email="", phone="", color="#2563eb",
+                 features=(), social=None, template="Business", slug=None):
+        if isinstance(features, str):
+            features = features.split(",")
+        try:
+            features = tuple([f.strip() for f in features])
+        except AttributeError:
+            raise ValueError("features must be strings")
+        if social is None:
+            social = Social()
+        elif not isinstance(social, Social):
+            social = Social(social.get("facebook") or "", social.get("twitter") or "", social.get("linkedin") or "")
+        if slug is not None and type(slug) is not str:
+            raise ValueError(f"slug must be a string, got {type(slug).__name__}")
+        values = (template, slug, name, description, email, phone, color, features, social)
+        for field, value in zip(self.__slots__, values):
+            if type(value) is not str and field not in NON_TEXT_FIELDS:
+                raise ValueError(f"{field} must be a string, got {type(value).__name__}")
+            object.__setattr__(self, field, value)
+        if not HEX_COLOR.fullmatch(color):
+            raise ValueError(f"color must look like #rrggbb, got {color!r}")
+
+    @classmethod
+    def from_dict(cls, spec):
+        # A JSONL spec or get_user_data-style dict; products and posts are
+        # not part of the model and stay with the dict path
+        return cls(**{key: value for key, value in spec.items() if key in SPEC_FIELDS and value is not None})
+
+    def as_dict(self):
+        return {
+            "template": self.template,
+            "name": self.name,
+            "description": self.description,
+            "email": self.email,
+            "phone": self.phone,
+            "color": self.color,
+            "features": list(self.features),
+            "social": dict(self.social)
+        }
+
+
+class SpecTable:
+    # Specs stored column by column. Each column keeps one copy of every
+    # distinct value (templates, colors, feature lists, social records), and
+    # feature strings are shared across all lists, so 100k similar specs cost
+    # a few pointers each. Rows come back as SiteSpec records.
+    def __init__(self):
+        self.columns = tuple([] for _ in SiteSpec.__slots__)
+        self.pools = tuple({} for _ in SiteSpec.__slots__)
+        self.strings = {}
+        self.features = SiteSpec.__slots__.index("features")
+
+    def append(self, spec):
+        if not isinstance(spec, SiteSpec):
+            spec = SiteSpec.from_dict(spec)
+        for index, (column, pool, value) in enumerate(zip(self.columns, self.pools, SiteSpec.fields(spec))):
+            pooled = pool.get(value)
+            if pooled is None:
+                if index == self.features:
+                    value = tuple(self.strings.setdefault(f, f) for f in value)
+                pooled = pool[value] = value
+            column.append(pooled)
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __getitem__(self, index):
+        return _restore(SiteSpec, [column[index] for column in self.columns])
+
+    def __iter__(self):
+        for values in zip(*self.columns):
+            yield _restore(SiteSpec, values)
+
+    def distinct(self):
+        return {name: len(pool) for name, pool in zip(SiteSpec.__slots__, self.pools)}
+
+
+def csv_spec(row):
+    # Empty cells count as missing; social links are one column per network
+    spec = {key: value for key, value in row.items() if key and value}
+    spec["social"] = {key: spec.pop(key) for key in SOCIAL_COLUMNS if key in spec}
+    return spec
+
+
+def load_table(path):
+    # CSV (a header row naming the spec fields, features comma-separated) or
+    # JSONL; a spec that fails validation stops the load with its line number
+    table = SpecTable()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            rows = ((reader.line_num, csv_spec(row)) for row in reader)
+        else:
+            rows = ((line_no, line) for line_no, line in enumerate(f, 1) if line.strip())
+        for line_no, row in rows:
+            try:
+                table.append(json.loads(row) if isinstance(row, str) else row)
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValueError(f"{path}:{line_no}: invalid spec: {e}")
+    return table
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import re
+import textwrap
+from functools import lru_cache
+from string import Formatter
+
+import templates
+from minify import minify_css, write_gzip
+from output import stream_to_file
+
+THEME_VARIABLE = "--primary"
+STYLE_BLOCK = re.compile(r"<style>(.*?)</style>", re.S)
+HASH_LENGTH = 8
+STYLESHEET_LINK = '<link rel="stylesheet" href="{stylesheet}">'
+
+
+def theme_variable(spec):
+    # {color} -> --primary, {color:dd} -> --primary-dd
+    return f"{THEME_VARIABLE}-{spec}" if spec else THEME_VARIABLE
+
+
+def split_stylesheet(source):
+    # Returns (static css, page template source). Theme slots in the <style>
+    # block become var() references; the page keeps a link to the shared file
+    # plus an inline :root block that sets only the variables it uses.
+    match = STYLE_BLOCK.search(source)
+    if match is None:
+        raise ValueError("template has no <style> block")
+    css = []
+    specs = []
+    for literal, field, spec, _ in Formatter().parse(match.group(1)):
+        css.append(literal)
+        if field is None:
+            continue
+        if field != templates.THEME_FIELD:
+            raise ValueError(f"stylesheet slot '{field}' is not the theme color")
+        css.append(f"var({theme_variable(spec)})")
+        if spec not in specs:
+            specs.append(spec)
+    link = STYLESHEET_LINK
+    if specs:
+        variables = ";".join(f"{theme_variable(spec)}:{{{templates.THEME_FIELD}{':' + spec if spec else ''}}}"
+                             for spec in specs)
+        link += "\n    <style>:root{{" + variables + "}}</style>"
+    return "".join(css), source[:match.start()] + link + source[match.end():]
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+class SharedStylesheet:
+    # One template's static CSS as a content-hashed file, and the page
+    # template that links to it
+    def __init__(self, name, minify=False):
+        page, self.build_values = templates.PAGES[name]
+        css, page_source = split_stylesheet(page.source)
+        self.css = minify_css(css) if minify else textwrap.dedent(css).strip() + "\n"
+        digest = hashlib.sha256(self.css.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+        self.filename = f"{slugify(name)}.{digest}.css"
+        self.page = templates.compile_template(page_source)
+
+    def values(self, data, prefix="", stream=False, **options):
+        values = self.build_values(data, stream=stream, **options)
+        values["stylesheet"] = prefix + self.filename
+        return values
+
+    def render(self, data, prefix=""):
+        return self.page.render(self.values(data, prefix))
+
+    def iter_render(self, data, prefix=""):
+        return self.page.iter_render(self.values(data, prefix, stream=True))
+
+    def write(self, out_dir, gzip_level=None):
+        # The name changes with the content, so an existing file is current
+        file_path = os.path.join(out_dir, self.filename)
+        if not os.path.exists(file_path):
+            stream_to_file(file_path, [self.css])
+        if gzip_level is not None and not os.path.exists(file_path + ".gz"):
+            write_gzip(file_path + ".gz", self.css.encode("utf-8"), gzip_level)
+        return file_path
+
+
+@lru_cache(maxsize=None)
+def shared_stylesheet(name, minify=False):
+    return SharedStylesheet(name, minify)
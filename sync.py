@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+
+from output import BUFFER_SIZE, stream_to
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 1
+# Pages up to this size are hashed in memory; larger ones spill to the temp file
+SPOOL_LIMIT = 1024 * 1024
+
+ADDED, MODIFIED, REMOVED = "A", "M", "D"
+
+
+class Spool:
+    # Write sink that hashes everything and keeps it in memory until
+    # SPOOL_LIMIT, so an unchanged page costs no disk writes at all
+    def __init__(self, temp_path, limit=SPOOL_LIMIT):
+        self.temp_path = temp_path
+        self.limit = limit
+        self.hash = hashlib.sha1()
+        self.parts = []
+        self.size = 0
+        self.file = None
+
+    def write(self, data):
+        self.hash.update(data)
+        self.size += len(data)
+        if self.file is not None:
+            self.file.write(data)
+            return
+        self.parts.append(data)
+        if self.size > self.limit:
+            self.file = open(self.temp_path, 'wb')
+            self.file.writelines(self.parts)
+            self.parts = []
+
+    def commit(self, file_path):
+        if self.file is None:
+            with open(self.temp_path, 'wb') as f:
+                f.writelines(self.parts)
+        else:
+            self.file.close()
+        os.replace(self.temp_path, file_path)
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+            os.remove(self.temp_path)
+        self.parts = []
+
+
+def write_if_changed(file_path, chunks, previous=None, buffer_size=BUFFER_SIZE, on_flush=None):
+    # Returns (digest, size, written). previous is the manifest entry
+    # [digest, size]; a match with the file on disk skips the write, anything
+    # else replaces the file atomically.
+    spool = Spool(f"{file_path}.{os.getpid()}.tmp")
+    try:
+        stream_to(spool, chunks, buffer_size, on_flush)
+        digest = spool.hash.hexdigest()
+        if previous and previous[0] == digest and previous[1] == spool.size and _size(file_path) == spool.size:
+            spool.discard()
+            return digest, spool.size, False
+        spool.commit(file_path)
+    except BaseException:
+        spool.discard()
+        if os.path.exists(spool.temp_path):
+            os.remove(spool.temp_path)
+        raise
+    return digest, spool.size, True
+
+
+def _size(file_path):
+    try:
+        return os.stat(file_path).st_size
+    except FileNotFoundError:
+        return None
+
+
+class BuildManifest:
+    # Output path (relative, "/" separated) -> [sha1, size] for one output
+    # directory, plus the changes made by the current run
+    def __init__(self, out_dir, force=False):
+        self.out_dir = out_dir
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self.prefix = os.path.join(out_dir, "")
+        self.files = {} if force else self._load()
+        self.seen = set()
+        self.changes = []
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest["files"]
+
+    def relative(self, file_path):
+        # Plain slicing for paths built from out_dir; relpath is slow at scale
+        if file_path.startswith(self.prefix):
+            path = file_path[len(self.prefix):]
+        else:
+            path = os.path.relpath(file_path, self.out_dir)
+        return path if os.sep == "/" else path.replace(os.sep, "/")
+
+    def previous(self, file_path):
+        return self.files.get(self.relative(file_path))
+
+    def record(self, file_path, digest, size, written, extra=()):
+        # extra: sibling files (e.g. .gz) rewritten along with this one
+        path = self.relative(file_path)
+        self.seen.add(path)
+        if written:
+            status = MODIFIED if path in self.files else ADDED
+            self.changes.append((status, path))
+            self.changes.extend((status, self.relative(p)) for p in extra)
+        self.files[path] = [digest, size]
+
+    def add_asset(self, file_path, written):
+        # Content-addressed files (shared stylesheets) are listed when new and
+        # recorded like pages, so a superseded one is pruned. The name changes
+        # with the content, so a known entry is current and not re-hashed.
+        path = self.relative(file_path)
+        self.seen.add(path)
+        if written:
+            self.changes.append((ADDED, path))
+        if path not in self.files:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            self.files[path] = [hashlib.sha1(data).hexdigest(), len(data)]
+
+    def keep(self, file_path):
+        # An output this run meant to produce but could not (e.g. its render
+        # failed): the last good file stays and is not pruned
+        self.seen.add(self.relative(file_path))
+
+    def remove(self, file_path):
+        # Deletes one output (and its .gz) whose source is gone
+        path = self.relative(file_path)
+        self.files.pop(path, None)
+        self.seen.discard(path)
+        for name in (path, path + ".gz"):
+            try:
+                os.remove(os.path.join(self.out_dir, name))
+            except FileNotFoundError:
+                continue
+            self.changes.append((REMOVED, name))
+
+    def prune(self, remove=False):
+        # Files from earlier runs that this run did not produce
+        stale = sorted(self.files.keys() - self.seen)
+        for path in stale:
+            if remove:
+                del self.files[path]
+                for name in (path, path + ".gz"):
+                    try:
+                        os.remove(os.path.join(self.out_dir, name))
+                    except FileNotFoundError:
+                        continue
+                    self.changes.append((REMOVED, name))
+        return stale
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        # json.dumps uses the C encoder; json.dump to a file does not
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"version": MANIFEST_VERSION, "files": self.files}, separators=(",", ":")))
+        os.replace(temp_path, self.path)
+
+    def write_changes(self, changes_path):
+        # One "A|M|D<TAB>path" line per change, for deploy tooling
+        temp_path = changes_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{status}\t{path}\n" for status, path in self.changes)
+        os.replace(temp_path, changes_path)
+
+    def counts(self):
+        counts = {ADDED: 0, MODIFIED: 0, REMOVED: 0}
+        for status, _ in self.changes:
+            counts[status] += 1
+        return counts
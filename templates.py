@@ -0,0 +1,1158 @@
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+from string import Formatter
+
+# Bump when template output changes so cached renders are invalidated
+TEMPLATE_VERSION = 5
+
+THEME_FIELD = "color"
+MAX_THEMES = 256
+
+# {_:About Us} marks a user-visible message. Normal renders print the English
+# text; marked variants print it between MARK characters instead, so one
+# render can be spliced into any number of locales (see locales.py).
+MESSAGE_FIELD = "_"
+MESSAGE = re.compile(r"\{_:([^{}]*)\}")
+MARK = "\x00"
+# Marked variants also carry these for the locale to fill in
+LANG_MESSAGE = "@lang"
+ALTERNATES_MESSAGE = "@alternates"
+DATE_MESSAGE = "@date"
+# A marked page's repeated list, filled in per locale from a LocalizedList
+LIST_MESSAGE = "@list"
+STORE_BANNER = "Welcome to Our Store"
+
+STATIC, THEME, SLOT = range(3)
+
+# Items joined per chunk when streaming repeated fragments
+STREAM_BATCH = 512
+
+COMPILED_ATTRIBUTES = {"chunks", "slots", "theme_segments", "fields", "render", "parts"}
+_compile_lock = threading.Lock()
+
+
+def mark(message):
+    return f"{MARK}{message}{MARK}"
+
+
+def marked_source(source):
+    # The page's language and a spot for hreflang links become messages too
+    source = source.replace('<html lang="en">', f'<html lang="{{_:{LANG_MESSAGE}}}">', 1)
+    return source.replace("</head>", f"{{_:{ALTERNATES_MESSAGE}}}</head>", 1)
+
+
+class ThemeSegment:
+    # Static text interleaved with theme color slots, rendered once per color
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.cache = {}
+
+    def render(self, color):
+        text = self.cache.get(color)
+        if text is None:
+            if len(self.cache) >= MAX_THEMES:
+                self.cache.clear()
+            text = "".join(p if isinstance(p, str) else color + p[0] for p in self.pieces)
+            self.cache[color] = text
+        return text
+
+
+class CompiledTemplate:
+    # Parsed and code-generated on first use, so a process only pays for the
+    # templates it actually renders
+    def __init__(self, source, marked=False):
+        self.source = source
+        self.marked = marked
+
+    def __getattr__(self, name):
+        if name not in COMPILED_ATTRIBUTES:
+            raise AttributeError(name)
+        with _compile_lock:
+            if name not in self.__dict__:
+                # Built aside and swapped in whole so other threads never see
+                # a half-parsed template
+                built = object.__new__(CompiledTemplate)
+                built._parse(marked_source(self.source) if self.marked else self.source, self.marked)
+                self.__dict__.update(built.__dict__)
+        return self.__dict__[name]
+
+    def with_markers(self):
+        # Cached marked variant; a race only builds a spare one
+        variant = self.__dict__.get("_marked")
+        if variant is None:
+            variant = self.__dict__["_marked"] = CompiledTemplate(self.source, marked=True)
+        return variant
+
+    def _parse(self, source, marked=False):
+        self.chunks = []
+        self.slots = []
+        self.theme_segments = []
+        segment = []
+        for literal, field, spec, _ in Formatter().parse(source):
+            if literal:
+                segment.append(literal)
+            if field is None:
+                continue
+            if field == MESSAGE_FIELD:
+                segment.append(mark(spec) if marked else spec)
+            elif field == THEME_FIELD:
+                # Format spec carries the hex alpha suffix, e.g. {color:dd}
+                segment.append((spec or "",))
+            else:
+                self._flush(segment)
+                segment = []
+                self.slots.append((len(self.chunks), field))
+                self.chunks.append(None)
+        self._flush(segment)
+        self.fields = {field for _, field in self.slots}
+        self.render = self._compile()
+        segments = dict(self.theme_segments)
+        fields = dict(self.slots)
+        self.parts = [(STATIC, chunk) if chunk is not None else
+                      (THEME, segments[index]) if index in segments else (SLOT, fields[index])
+                      for index, chunk in enumerate(self.chunks)]
+
+    def _flush(self, segment):
+        if not segment:
+            return
+        if all(isinstance(p, str) for p in segment):
+            self.chunks.append("".join(segment))
+        else:
+            self.theme_segments.append((len(self.chunks), ThemeSegment(segment)))
+            self.chunks.append(None)
+
+    def _compile(self):
+        # Generate a single join over the precomputed chunks so a render
+        # does no per-slot Python looping
+        segments = dict(self.theme_segments)
+        fields = dict(self.slots)
+        namespace = {}
+        args = []
+        for index, chunk in enumerate(self.chunks):
+            if index in fields:
+                args.append(f"values[{fields[index]!r}]")
+            elif index in segments:
+                namespace[f"s{index}"] = segments[index].render
+                args.append(f"s{index}(color)")
+            else:
+                namespace[f"c{index}"] = chunk
+                args.append(f"c{index}")
+        body = "    color = values[%r]\n" % THEME_FIELD if self.theme_segments else ""
+        source = f"def render(values):\n{body}    return ''.join(({', '.join(args)},))\n"
+        exec(source, namespace)
+        return namespace["render"]
+
+    def iter_render(self, values):
+        # Slot values may be strings or iterables of chunks (nested streams)
+        color = values.get(THEME_FIELD)
+        for kind, payload in self.parts:
+            if kind is STATIC:
+                yield payload
+            elif kind is THEME:
+                yield payload.render(color)
+            else:
+                value = values[payload]
+                if isinstance(value, str):
+                    yield value
+                else:
+                    yield from value
+
+
+class RepeatedFragment:
+    # A single-slot fragment repeated per item, rendered with one str.join
+    def __init__(self, source, separator):
+        self.source = source
+        self.separator = separator
+        resolved = MESSAGE.sub(lambda m: m.group(1), source)
+        self.prefix, self.suffix = resolved.split("{}")
+        self.joiner = self.suffix + separator + self.prefix
+        self.messages = MESSAGE.findall(source)
+        self._localized = {}
+
+    def localized(self, table):
+        # This fragment with its messages translated from table, built once
+        # per distinct translation
+        if not self.messages:
+            return self
+        key = tuple([table.get(message, message) for message in self.messages])
+        variant = self._localized.get(key)
+        if variant is None:
+            # Split before translating, so a translation may contain "{}"
+            translations = dict(zip(self.messages, key))
+            prefix, suffix = [MESSAGE.sub(lambda m: translations[m.group(1)], part) for part in self.source.split("{}")]
+            variant = self._localized[key] = RepeatedFragment("{}", self.separator)
+            variant.prefix, variant.suffix = prefix, suffix
+            variant.joiner = suffix + self.separator + prefix
+        return variant
+
+    def render(self, items):
+        if not isinstance(items, (list, tuple)):
+            items = list(items)
+        if not items:
+            return ""
+        return self.prefix + self.joiner.join(items) + self.suffix
+
+    def iter_render(self, items, batch_size=STREAM_BATCH):
+        # Joins items in fixed-size batches to keep per-chunk overhead low
+        lead = self.prefix
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield lead + self.joiner.join(batch)
+                lead = self.joiner
+                batch.clear()
+        if batch:
+            yield lead + self.joiner.join(batch)
+            lead = self.joiner
+        if lead is not self.prefix:
+            yield self.suffix
+
+
+def compile_template(source):
+    return CompiledTemplate(source)
+
+
+BUSINESS = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name}</title>
+    <style>
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+        body {{
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+        }}
+        .header {{
+            background: linear-gradient(135deg, {color} 0%, {color:dd} 100%);
+            color: white;
+            padding: 1rem 0;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }}
+        .nav {{
+            max-width: 1200px;
+            margin: 0 auto;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 0 2rem;
+        }}
+        .logo {{
+            font-size: 1.8rem;
+            font-weight: bold;
+        }}
+        .nav-links {{
+            display: flex;
+            gap: 2rem;
+            list-style: none;
+        }}
+        .nav-links a {{
+            color: white;
+            text-decoration: none;
+            transition: opacity 0.3s;
+        }}
+        .nav-links a:hover {{
+            opacity: 0.8;
+        }}
+        .hero {{
+            background: linear-gradient(135deg, {color:22} 0%, {color:44} 100%);
+            padding: 5rem 2rem;
+            text-align: center;
+        }}
+        .hero h1 {{
+            font-size: 3rem;
+            margin-bottom: 1rem;
+            color: {color};
+        }}
+        .hero p {{
+            font-size: 1.3rem;
+            max-width: 800px;
+            margin: 0 auto 2rem;
+            color: #555;
+        }}
+        .cta-button {{
+            display: inline-block;
+            padding: 1rem 2.5rem;
+            background: {color};
+            color: white;
+            text-decoration: none;
+            border-radius: 50px;
+            font-size: 1.1rem;
+            transition: transform 0.3s, box-shadow 0.3s;
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+        }}
+        .cta-button:hover {{
+            transform: translateY(-2px);
+            box-shadow: 0 6px 20px rgba(0,0,0,0.3);
+        }}
+        .features {{
+            max-width: 1200px;
+            margin: 4rem auto;
+            padding: 0 2rem;
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 2rem;
+        }}
+        .feature {{
+            text-align: center;
+            padding: 2rem;
+            background: white;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            transition: transform 0.3s;
+        }}
+        .feature:hover {{
+            transform: translateY(-5px);
+            box-shadow: 0 6px 12px rgba(0,0,0,0.15);
+        }}
+        .feature-icon {{
+            font-size: 3rem;
+            color: {color};
+            margin-bottom: 1rem;
+        }}
+        .about {{
+            background: #f8f9fa;
+            padding: 4rem 2rem;
+            text-align: center;
+        }}
+        .about-content {{
+            max-width: 800px;
+            margin: 0 auto;
+        }}
+        .about h2 {{
+            font-size: 2.5rem;
+            color: {color};
+            margin-bottom: 1.5rem;
+        }}
+        .contact {{
+            max-width: 600px;
+            margin: 4rem auto;
+            padding: 0 2rem;
+        }}
+        .contact h2 {{
+            text-align: center;
+            font-size: 2.5rem;
+            color: {color};
+            margin-bottom: 2rem;
+        }}
+        .contact-info {{
+            background: white;
+            padding: 2rem;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }}
+        .contact-item {{
+            margin: 1rem 0;
+            font-size: 1.1rem;
+        }}
+        .contact-item strong {{
+            color: {color};
+        }}
+        .footer {{
+            background: #2c3e50;
+            color: white;
+            text-align: center;
+            padding: 2rem;
+            margin-top: 4rem;
+        }}
+        .social-links {{
+            margin: 1rem 0;
+        }}
+        .social-link {{
+            color: white;
+            text-decoration: none;
+            margin: 0 1rem;
+            transition: opacity 0.3s;
+        }}
+        .social-link:hover {{
+            opacity: 0.7;
+        }}
+        @media (max-width: 768px) {{
+            .hero h1 {{
+                font-size: 2rem;
+            }}
+            .nav-links {{
+                display: none;
+            }}
+        }}
+    </style>
+</head>
+<body>
+    <header class="header">
+        <nav class="nav">
+            <div class="logo">{name}</div>
+            <ul class="nav-links">
+                <li><a href="#home">{_:Home}</a></li>
+                <li><a href="#features">{_:Features}</a></li>
+                <li><a href="#about">{_:About}</a></li>
+                <li><a href="#contact">{_:Contact}</a></li>
+            </ul>
+        </nav>
+    </header>
+
+    <section id="home" class="hero">
+        <h1>{_:Welcome to} {name}</h1>
+        <p>{description}</p>
+        <a href="#contact" class="cta-button">{_:Get Started}</a>
+    </section>
+
+    <section id="features" class="features">
+        {features}
+    </section>
+
+    <section id="about" class="about">
+        <div class="about-content">
+            <h2>{_:About Us}</h2>
+            <p>{description}</p>
+            <p>{_:We are committed to delivering excellence and exceeding expectations in everything we do.}</p>
+        </div>
+    </section>
+
+    <section id="contact" class="contact">
+        <h2>{_:Contact Us}</h2>
+        <div class="contact-info">
+            <div class="contact-item"><strong>{_:Email:}</strong> {email}</div>
+            <div class="contact-item"><strong>{_:Phone:}</strong> {phone}</div>
+            <div class="contact-item"><strong>{_:Address:}</strong> 123 Business Street, City, Country</div>
+        </div>
+    </section>
+
+    <footer class="footer">
+        <div class="social-links">
+            {social}
+        </div>
+        <p>&copy; {year} {name}. {_:All rights reserved.}</p>
+    </footer>
+</body>
+</html>''')
+
+
+PORTFOLIO = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name} - {_:Portfolio}</title>
+    <style>
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+        body {{
+            font-family: 'Arial', sans-serif;
+            background: #0a0a0a;
+            color: #fff;
+        }}
+        .hero {{
+            height: 100vh;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            text-align: center;
+            background: linear-gradient(135deg, {color:33} 0%, #0a0a0a 100%);
+        }}
+        .hero h1 {{
+            font-size: 4rem;
+            margin-bottom: 1rem;
+            animation: fadeInUp 1s ease;
+        }}
+        .hero p {{
+            font-size: 1.5rem;
+            opacity: 0.8;
+            animation: fadeInUp 1.2s ease;
+        }}
+        @keyframes fadeInUp {{
+            from {{
+                opacity: 0;
+                transform: translateY(30px);
+            }}
+            to {{
+                opacity: 1;
+                transform: translateY(0);
+            }}
+        }}
+        .section {{
+            max-width: 1200px;
+            margin: 4rem auto;
+            padding: 0 2rem;
+        }}
+        .section h2 {{
+            font-size: 2.5rem;
+            margin-bottom: 2rem;
+            color: {color};
+        }}
+        .skills {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 2rem;
+        }}
+        .skill {{
+            background: #1a1a1a;
+            padding: 2rem;
+            border-radius: 10px;
+            text-align: center;
+            transition: transform 0.3s;
+        }}
+        .skill:hover {{
+            transform: scale(1.05);
+            background: {color:22};
+        }}
+        .contact {{
+            text-align: center;
+            padding: 4rem 2rem;
+        }}
+        .contact a {{
+            display: inline-block;
+            margin: 1rem;
+            padding: 1rem 2rem;
+            background: {color};
+            color: white;
+            text-decoration: none;
+            border-radius: 5px;
+        }}
+    </style>
+</head>
+<body>
+    <section class="hero">
+        <div>
+            <h1>{name}</h1>
+            <p>{description}</p>
+        </div>
+    </section>
+    
+    <section class="section">
+        <h2>{_:Skills & Expertise}</h2>
+        <div class="skills">
+            {features}
+        </div>
+    </section>
+    
+    <section class="contact">
+        <h2>{_:Let's Work Together}</h2>
+        <a href="mailto:{email}">{_:Contact Me}</a>
+    </section>
+</body>
+</html>''')
+
+
+ECOMMERCE = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name} - {_:Shop}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: Arial, sans-serif; }}
+        .header {{
+            background: {color};
+            color: white;
+            padding: 1rem 2rem;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }}
+        .logo {{ font-size: 1.5rem; font-weight: bold; }}
+        .cart {{ font-size: 1.5rem; cursor: pointer; }}
+        .banner {{
+            background: linear-gradient(135deg, {color:44}, {color:88});
+            padding: 4rem 2rem;
+            text-align: center;
+        }}
+        .banner h1 {{ font-size: 3rem; color: white; margin-bottom: 1rem; }}
+        .products {{
+            max-width: 1200px;
+            margin: 3rem auto;
+            padding: 0 2rem;
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 2rem;
+        }}
+        .product {{
+            background: white;
+            border-radius: 10px;
+            padding: 1.5rem;
+            text-align: center;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            transition: transform 0.3s;
+        }}
+        .product:hover {{ transform: translateY(-5px); }}
+        .product-image {{
+            font-size: 4rem;
+            margin-bottom: 1rem;
+        }}
+        .price {{
+            font-size: 1.5rem;
+            color: {color};
+            font-weight: bold;
+            margin: 1rem 0;
+        }}
+        .buy-btn {{
+            background: {color};
+            color: white;
+            border: none;
+            padding: 0.75rem 2rem;
+            border-radius: 5px;
+            cursor: pointer;
+            font-size: 1rem;
+        }}
+        .buy-btn:hover {{ opacity: 0.9; }}
+    </style>
+</head>
+<body>
+    <header class="header">
+        <div class="logo">{name}</div>
+        <div class="cart">🛒 (0)</div>
+    </header>{search}
+    
+    <section class="banner">
+        <h1>{banner_title}</h1>
+        <p>{description}</p>
+    </section>
+    
+    <section class="products">
+        {products}
+    </section>{pagination}
+</body>
+</html>''')
+
+
+BLOG = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: Georgia, serif; line-height: 1.8; color: #333; }}
+        .header {{
+            background: white;
+            border-bottom: 3px solid {color};
+            padding: 2rem;
+            text-align: center;
+        }}
+        .header h1 {{ font-size: 2.5rem; color: {color}; }}
+        .container {{ max-width: 800px; margin: 3rem auto; padding: 0 2rem; }}
+        .post {{
+            background: white;
+            padding: 2rem;
+            margin-bottom: 2rem;
+            border-radius: 10px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        }}
+        .post h2 {{ color: {color}; margin-bottom: 0.5rem; }}
+        .post-meta {{ color: #888; margin-bottom: 1rem; font-size: 0.9rem; }}
+        .read-more {{
+            color: {color};
+            text-decoration: none;
+            font-weight: bold;
+        }}
+    </style>
+</head>
+<body>
+    <header class="header">
+        <h1>{name}</h1>
+        <p>{description}</p>
+    </header>{search}
+    
+    <div class="container">
+        {posts}
+    </div>{pagination}
+</body>
+</html>''')
+
+
+LANDING = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: 'Helvetica', Arial, sans-serif; }}
+        .hero {{
+            height: 100vh;
+            background: linear-gradient(135deg, {color} 0%, {color:cc} 100%);
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            text-align: center;
+            color: white;
+        }}
+        .hero h1 {{ font-size: 4rem; margin-bottom: 1rem; }}
+        .hero p {{ font-size: 1.5rem; margin-bottom: 2rem; max-width: 600px; }}
+        .cta {{
+            display: inline-block;
+            padding: 1.5rem 3rem;
+            background: white;
+            color: {color};
+            text-decoration: none;
+            border-radius: 50px;
+            font-size: 1.2rem;
+            font-weight: bold;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+            transition: transform 0.3s;
+        }}
+        .cta:hover {{ transform: translateY(-3px); }}
+        .features {{
+            padding: 4rem 2rem;
+            max-width: 1200px;
+            margin: 0 auto;
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 2rem;
+        }}
+        .feature {{
+            text-align: center;
+            padding: 2rem;
+        }}
+        .feature-icon {{ font-size: 3rem; margin-bottom: 1rem; }}
+    </style>
+</head>
+<body>
+    <section class="hero">
+        <div>
+            <h1>{name}</h1>
+            <p>{description}</p>
+            <a href="#{email}" class="cta">{_:Get Started Now}</a>
+        </div>
+    </section>
+    
+    <section class="features">
+        {features}
+    </section>
+</body>
+</html>''')
+
+
+RESTAURANT = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name} - {_:Restaurant}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: 'Georgia', serif; color: #3b2f2f; background: #fffaf3; }}
+        .hero {{
+            padding: 6rem 2rem;
+            text-align: center;
+            background: linear-gradient(135deg, {color} 0%, {color:aa} 100%);
+            color: white;
+        }}
+        .hero h1 {{ font-size: 3.5rem; margin-bottom: 1rem; }}
+        .hero p {{ font-size: 1.3rem; max-width: 700px; margin: 0 auto 2rem; }}
+        .reserve {{
+            display: inline-block;
+            padding: 1rem 2.5rem;
+            background: white;
+            color: {color};
+            text-decoration: none;
+            border-radius: 5px;
+            font-weight: bold;
+        }}
+        .menu {{
+            max-width: 1000px;
+            margin: 4rem auto;
+            padding: 0 2rem;
+        }}
+        .menu h2 {{
+            text-align: center;
+            font-size: 2.5rem;
+            color: {color};
+            margin-bottom: 2rem;
+        }}
+        .dishes {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 1.5rem;
+        }}
+        .dish {{
+            background: white;
+            padding: 1.5rem;
+            border-left: 4px solid {color};
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        }}
+        .dish-tag {{ color: #999; font-style: italic; font-size: 0.9rem; }}
+        .visit {{
+            background: #3b2f2f;
+            color: white;
+            text-align: center;
+            padding: 3rem 2rem;
+        }}
+        .visit h2 {{ margin-bottom: 1rem; }}
+    </style>
+</head>
+<body>
+    <section class="hero">
+        <h1>{name}</h1>
+        <p>{description}</p>
+        <a href="tel:{phone}" class="reserve">{_:Reserve a Table}</a>
+    </section>
+    
+    <section class="menu">
+        <h2>{_:Our Menu}</h2>
+        <div class="dishes">
+            {features}
+        </div>
+    </section>
+    
+    <section class="visit">
+        <h2>{_:Visit Us}</h2>
+        <p>{_:Reservations:} {phone} &middot; {email}</p>
+        <p>&copy; {year} {name}</p>
+    </section>
+</body>
+</html>''')
+
+
+BUSINESS_FEATURE = RepeatedFragment('<div class="feature"><div class="feature-icon">✓</div><h3>{}</h3></div>', "\n")
+PORTFOLIO_SKILL = RepeatedFragment('<div class="skill"><h3>{}</h3></div>', " ")
+LANDING_FEATURE = RepeatedFragment('<div class="feature"><div class="feature-icon">⭐</div><h3>{}</h3></div>', " ")
+RESTAURANT_DISH = RepeatedFragment('<div class="dish"><h3>{}</h3><span class="dish-tag">{_:Chef\'s Special}</span></div>', "\n")
+
+PRODUCT_CARD = compile_template('''<div class="product">
+                <div class="product-image">📦</div>
+                <h3>{name}</h3>
+                <p class="price">{price}</p>
+                <button class="buy-btn">{_:Add to Cart}</button>
+            </div>''')
+
+SAMPLE_PRODUCTS = [
+    {"name": "Product 1", "price": "$99.99"},
+    {"name": "Product 2", "price": "$149.99"},
+    {"name": "Product 3", "price": "$79.99"},
+    {"name": "Product 4", "price": "$199.99"}
+]
+PRODUCT_LIST = RepeatedFragment("{}", "\n")
+
+BLOG_SUMMARY = compile_template('''<article class="post">
+            <h2>{title}</h2>
+            <div class="post-meta">{_:Posted on} {date}</div>
+            <p>{summary}</p>
+            <a href="{href}" class="read-more">{_:Read more →}</a>
+        </article>''')
+
+BLOG_ARTICLE = compile_template('''<article class="post">
+            <h2>{title}</h2>
+            <div class="post-meta">{_:Posted on} {date}{tags}</div>
+            {body}
+            <a href="{back}" class="read-more">{_:← All posts}</a>
+        </article>''')
+
+BLOG_POSTS = RepeatedFragment("{}", "\n        \n        ")
+
+SAMPLE_POSTS = [
+    {"title": "Welcome to My Blog", "href": "#",
+     "summary": "This is your new blog. Start sharing your thoughts, stories, and expertise with the world. \n"
+                "            Create engaging content that resonates with your audience and builds a community around your passion."},
+    {"title": "Getting Started", "href": "#",
+     "summary": "Welcome to your blogging journey! This template provides a clean, readable design perfect for \n"
+                "            sharing your ideas. Customize it to match your style and start publishing amazing content."}
+]
+
+SOCIAL_NETWORKS = [("facebook", "Facebook"), ("twitter", "Twitter"), ("linkedin", "LinkedIn")]
+
+
+def template_values(data):
+    values = dict(data)
+    values["year"] = str(datetime.now().year)
+    return values
+
+
+def social_links(social):
+    return "".join([f'<a href="{social[key]}" class="social-link">{label}</a>'
+                    for key, label in SOCIAL_NETWORKS if social[key]])
+
+
+def repeat(fragment, items, stream, block_size=None):
+    if block_size:
+        blocks = iter_blocks(fragment, items, block_size)
+        return blocks if stream else "".join(blocks)
+    return fragment.iter_render(items) if stream else fragment.render(items)
+
+
+# Perf output (see perf.py) puts long lists in blocks of block_size items. The
+# first block is live; later ones are inert <template>s revealed on scroll, so
+# the initial DOM holds one block however long the list is.
+LIVE_BLOCK = ('<div class="perf-block">', '</div>')
+LATER_BLOCK = ('<template class="perf-later"><div class="perf-block">', '</div></template>')
+
+
+def iter_blocks(fragment, items, block_size):
+    opening, closing = LIVE_BLOCK
+    block = []
+    for item in items:
+        block.append(item)
+        if len(block) == block_size:
+            yield opening + fragment.render(block) + closing
+            opening, closing = LATER_BLOCK
+            block = []
+    if block:
+        yield opening + fragment.render(block) + closing
+
+
+@lru_cache(maxsize=None)
+def item_parts(source):
+    # A repeated item's source as ((kind, text), ...): STATIC text, a message
+    # (SLOT with MESSAGE_FIELD) or a slot field
+    parts = []
+    for literal, field, spec, _ in Formatter().parse(source):
+        if literal:
+            parts.append((STATIC, literal))
+        if field == MESSAGE_FIELD:
+            parts.append((MESSAGE_FIELD, spec))
+        elif field == THEME_FIELD:
+            raise ValueError("repeated items cannot use the theme color")
+        elif field is not None:
+            parts.append((SLOT, field))
+    return tuple(parts)
+
+
+class LocalizedList:
+    # A page's repeated list for a marked render (see locales.py): the page
+    # shows it as one LIST_MESSAGE, and render(table) gives it in one locale.
+    # Messages are translated once per locale in the fragment, not per item;
+    # items rendered through an item template are flattened to their slot
+    # values once, so each locale is a single join.
+    def __init__(self, fragment, items, item=None):
+        self.fragment = fragment
+        self.item = item
+        if item is None:
+            self.items = items if isinstance(items, list) else list(items)
+            return
+        rows = items if isinstance(items, list) else list(items)
+        self.count = len(rows)
+        # A field holding the same marked message in every row (e.g. the
+        # sample posts' date) is translated like the item's own messages
+        self.parts = []
+        for kind, text in item_parts(item.source):
+            if kind == SLOT and rows:
+                first = rows[0][text]
+                if first[:1] == MARK and first[-1:] == MARK and all(row[text] == first for row in rows):
+                    kind, text = MESSAGE_FIELD, first[1:-1]
+            self.parts.append((kind, text))
+        fields = [text for kind, text in self.parts if kind == SLOT]
+        self.values = [row[field] for row in rows for field in fields]
+        self.fields = len(fields)
+        # Other marked values (a default date among posts with their own)
+        self.marked = []
+        if MARK in "".join(self.values):
+            self.marked = [(i, value[1:-1]) for i, value in enumerate(self.values)
+                           if value[:1] == MARK and value[-1:] == MARK and len(value) > 1]
+
+    def render(self, table):
+        fragment = self.fragment.localized(table)
+        if self.item is None:
+            return fragment.render(self.items)
+        if not self.count:
+            return ""
+        # Static text around each slot in this locale: statics[i] precedes
+        # field i, statics[-1] ends the item
+        statics = [""]
+        for kind, text in self.parts:
+            if kind == SLOT:
+                statics.append("")
+            else:
+                statics[-1] += table.get(text, text) if kind == MESSAGE_FIELD else text
+        if not self.fields:
+            return fragment.render([statics[0]] * self.count)
+        gaps = (statics[1:-1] + [statics[-1] + fragment.joiner + statics[0]]) * self.count
+        gaps[-1] = statics[-1] + fragment.suffix
+        parts = [None] * (2 * len(self.values) + 1)
+        parts[0] = fragment.prefix + statics[0]
+        parts[1::2] = self.values
+        parts[2::2] = gaps
+        for i, message in self.marked:
+            parts[2 * i + 1] = table.get(message, message)
+        return "".join(parts)
+
+
+def marked_list(values, fragment, items, item=None):
+    # The slot value for a marked page's list, which is kept aside in values
+    values[LIST_MESSAGE] = LocalizedList(fragment, items, item)
+    return mark(LIST_MESSAGE)
+
+
+# With marked, lists whose items carry messages become a LocalizedList, to go
+# with the page's with_markers() variant
+def business_values(data, stream=False, block_size=None, marked=False):
+    values = template_values(data)
+    values["features"] = repeat(BUSINESS_FEATURE, data['features'], stream, block_size)
+    values["social"] = social_links(data['social'])
+    return values
+
+
+def portfolio_values(data, stream=False, block_size=None, marked=False):
+    values = template_values(data)
+    values["features"] = repeat(PORTFOLIO_SKILL, data['features'], stream, block_size)
+    return values
+
+
+def ecommerce_values(data, stream=False, products=None, title=None, pagination="", search="", block_size=None,
+                     marked=False):
+    values = template_values(data)
+    if products is None:
+        products = data.get("products")
+        if products is None:
+            products = SAMPLE_PRODUCTS
+    if marked:
+        values["products"] = marked_list(values, PRODUCT_LIST, products, PRODUCT_CARD)
+    else:
+        values["products"] = repeat(PRODUCT_LIST, map(PRODUCT_CARD.render, products), stream, block_size)
+    if title is None:
+        title = mark(STORE_BANNER) if marked else STORE_BANNER
+    values["banner_title"] = title
+    values["pagination"] = pagination
+    values["search"] = search
+    return values
+
+
+def blog_values(data, stream=False, articles=None, pagination="", search="", block_size=None, marked=False):
+    # articles are pre-rendered <article> blocks; otherwise data['posts'] (title,
+    # summary, optional date/href) or the sample posts are shown
+    values = template_values(data)
+    if articles is None:
+        date = mark(DATE_MESSAGE) if marked else datetime.now().strftime("%B %d, %Y")
+        posts = data.get("posts")
+        if posts is None:
+            posts = SAMPLE_POSTS
+        rows = [dict({"date": date, "href": "#"}, **post) for post in posts]
+        if marked:
+            values["posts"] = marked_list(values, BLOG_POSTS, rows, BLOG_SUMMARY)
+        else:
+            values["posts"] = repeat(BLOG_POSTS, map(BLOG_SUMMARY.render, rows), stream, block_size)
+    else:
+        values["posts"] = repeat(BLOG_POSTS, articles, stream, block_size)
+    values["pagination"] = pagination
+    values["search"] = search
+    return values
+
+
+def landing_values(data, stream=False, block_size=None, marked=False):
+    values = template_values(data)
+    values["features"] = repeat(LANDING_FEATURE, data['features'], stream, block_size)
+    return values
+
+
+def restaurant_values(data, stream=False, block_size=None, marked=False):
+    values = template_values(data)
+    if marked:
+        values["features"] = marked_list(values, RESTAURANT_DISH, data['features'])
+    else:
+        values["features"] = repeat(RESTAURANT_DISH, data['features'], stream, block_size)
+    return values
+
+
+def generate_business_template(data):
+    return BUSINESS.render(business_values(data))
+
+
+def generate_portfolio_template(data):
+    return PORTFOLIO.render(portfolio_values(data))
+
+
+def generate_ecommerce_template(data):
+    return ECOMMERCE.render(ecommerce_values(data))
+
+
+def generate_blog_template(data):
+    return BLOG.render(blog_values(data))
+
+
+def generate_landing_template(data):
+    return LANDING.render(landing_values(data))
+
+
+def generate_restaurant_template(data):
+    return RESTAURANT.render(restaurant_values(data))
+
+
+def iter_business_template(data):
+    return BUSINESS.iter_render(business_values(data, stream=True))
+
+
+def iter_portfolio_template(data):
+    return PORTFOLIO.iter_render(portfolio_values(data, stream=True))
+
+
+def iter_ecommerce_template(data):
+    return ECOMMERCE.iter_render(ecommerce_values(data, stream=True))
+
+
+def iter_blog_template(data):
+    return BLOG.iter_render(blog_values(data, stream=True))
+
+
+def iter_landing_template(data):
+    return LANDING.iter_render(landing_values(data, stream=True))
+
+
+def iter_restaurant_template(data):
+    return RESTAURANT.iter_render(restaurant_values(data, stream=True))
+
+
+TEMPLATES = {
+    "Business": generate_business_template,
+    "Portfolio": generate_portfolio_template,
+    "E-commerce": generate_ecommerce_template,
+    "Blog": generate_blog_template,
+    "Landing Page": generate_landing_template,
+    "Restaurant": generate_restaurant_template
+}
+
+
+def with_styles(page, styles):
+    # A variant of page with extra rules at the end of its <style> block
+    return compile_template(page.source.replace("    </style>", styles + "    </style>", 1))
+
+
+# Multi-page variants, whose pagination rules (and a blog post's tag links)
+# single pages would never use
+CATALOG = with_styles(ECOMMERCE, '''        .pagination {{ text-align: center; margin: 0 auto 3rem; }}
+        .pagination a {{ color: {color}; margin: 0 1rem; font-weight: bold; text-decoration: none; }}
+''')
+BLOG_SITE = with_styles(BLOG, '''        .post-meta a, .pagination a {{ color: {color}; text-decoration: none; }}
+        .pagination {{ max-width: 800px; margin: 0 auto 3rem; padding: 0 2rem; text-align: center; }}
+        .pagination a {{ margin: 0 1rem; font-weight: bold; }}
+''')
+
+# Page template and value builder per template, for alternative page layouts
+PAGES = {
+    "Business": (BUSINESS, business_values),
+    "Portfolio": (PORTFOLIO, portfolio_values),
+    "E-commerce": (ECOMMERCE, ecommerce_values),
+    "Blog": (BLOG, blog_values),
+    "Landing Page": (LANDING, landing_values),
+    "Restaurant": (RESTAURANT, restaurant_values),
+    "Catalog": (CATALOG, ecommerce_values),
+    "Blog site": (BLOG_SITE, blog_values)
+}
+
+STREAMING_TEMPLATES = {
+    "Business": iter_business_template,
+    "Portfolio": iter_portfolio_template,
+    "E-commerce": iter_ecommerce_template,
+    "Blog": iter_blog_template,
+    "Landing Page": iter_landing_template,
+    "Restaurant": iter_restaurant_template
+}
+
+
+def iter_template(template, data):
+    # Chunks for a template, falling back to a single full render
+    if template in STREAMING_TEMPLATES:
+        return STREAMING_TEMPLATES[template](data)
+    return iter([TEMPLATES[template](data)])
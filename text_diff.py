@@ -0,0 +1,59 @@
+from difflib import SequenceMatcher
+
+# Above this share of changed lines a full replace is cheaper than patching
+FULL_REPLACE_RATIO = 0.5
+
+
+def diff_lines(old_lines, new_lines):
+    # Hunks of (old_start, old_end, replacement_lines), top to bottom
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+
+    old_middle = old_lines[prefix:len(old_lines) - suffix]
+    new_middle = new_lines[prefix:len(new_lines) - suffix]
+    if not old_middle or not new_middle:
+        if not old_middle and not new_middle:
+            return []
+        return [(prefix, prefix + len(old_middle), new_middle)]
+
+    hunks = []
+    matcher = SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            hunks.append((prefix + i1, prefix + i2, new_middle[j1:j2]))
+    return hunks
+
+
+def apply_diff(text, old, new):
+    # Patch a Tk Text widget holding `old` so it holds `new`; returns the
+    # number of changed lines, or None when it fell back to a full replace
+    old_lines = old.split("\n")
+    new_lines = new.split("\n")
+    hunks = diff_lines(old_lines, new_lines)
+    changed = sum(max(i2 - i1, len(lines)) for i1, i2, lines in hunks)
+    if changed > len(new_lines) * FULL_REPLACE_RATIO:
+        first = text.yview()[0]
+        text.delete("1.0", "end")
+        text.insert("1.0", new)
+        text.yview_moveto(first)
+        return None
+
+    # Bottom-up so earlier line numbers stay valid
+    for i1, i2, lines in reversed(hunks):
+        if i2 < len(old_lines):
+            text.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+            text.insert(f"{i1 + 1}.0", "".join(line + "\n" for line in lines))
+        elif i1 == 0:
+            text.delete("1.0", "end-1c")
+            text.insert("1.0", "\n".join(lines))
+        else:
+            # The last line has no newline of its own, so take the one before it
+            text.delete(f"{i1}.end", "end-1c")
+            text.insert(f"{i1}.end", "".join("\n" + line for line in lines))
+    return changed
@@ -0,0 +1,119 @@
+import re
+import tkinter as tk
+from tkinter import ttk
+
+from text_diff import apply_diff
+
+# Lines kept in the Text widget at once, and how far past the view they reach
+WINDOW_LINES = 600
+MARGIN_LINES = 200
+# Longer lines (minified output) are cut into rows so the window stays small
+MAX_LINE_CHARS = 4000
+
+SECTION_ID = re.compile(r"""<section\b[^>]*?\bid\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+
+
+def split_lines(text):
+    lines = text.split("\n")
+    if max(map(len, lines)) <= MAX_LINE_CHARS:
+        return lines
+    rows = []
+    for line in lines:
+        if len(line) > MAX_LINE_CHARS:
+            rows.extend(line[i:i + MAX_LINE_CHARS] for i in range(0, len(line), MAX_LINE_CHARS))
+        else:
+            rows.append(line)
+    return rows
+
+
+def section_index(lines):
+    # Section id -> buffer line of its first <section id=...>, in document order
+    sections = {}
+    for number, line in enumerate(lines):
+        if "<section" in line or "<SECTION" in line:
+            for match in SECTION_ID.finditer(line):
+                sections.setdefault(match.group(1), number)
+    return sections
+
+
+class VirtualPreview(ttk.Frame):
+    # Read-only text view over a document of any size. The whole document
+    # lives in self.lines; only WINDOW_LINES of it are in the Text widget,
+    # moved along as the view nears either end. The scrollbar is driven by
+    # buffer positions, so it covers the whole document.
+    def __init__(self, master, window=WINDOW_LINES, margin=MARGIN_LINES, **text_options):
+        super().__init__(master)
+        self.window = window
+        self.margin = margin
+        self.lines = [""]
+        self.sections = {}
+        self.top = 0
+        self.shown = ""
+        self.text = tk.Text(self, state=tk.DISABLED, yscrollcommand=self._on_scroll, **text_options)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+    def set_text(self, text):
+        # Keeps the current window, so an edit patches only the lines it changed
+        self.lines = split_lines(text)
+        self.sections = section_index(self.lines)
+        self._show(self.top)
+
+    def get_text(self):
+        return "\n".join(self.lines)
+
+    def first_visible(self):
+        return self.top + int(self.text.index("@0,0").split(".")[0]) - 1
+
+    def see_line(self, line):
+        # Scroll so buffer line `line` is at the top of the view
+        line = max(0, min(line, len(self.lines) - 1))
+        if self._outside(line, line + self.margin // 2):
+            self._show(line - self.margin)
+        self.text.yview(f"{line - self.top + 1}.0")
+
+    def jump(self, section_id):
+        if section_id in self.sections:
+            self.see_line(self.sections[section_id])
+
+    def yview(self, *args):
+        if args and args[0] == "moveto":
+            self.see_line(int(float(args[1]) * len(self.lines)))
+        else:
+            # Unit and page scrolls move within the window; _on_scroll slides it
+            self.text.yview(*args)
+
+    def _show(self, top):
+        top = max(0, min(top, len(self.lines) - self.window))
+        shown = "\n".join(self.lines[top:top + self.window])
+        self.text.config(state=tk.NORMAL)
+        if top == self.top:
+            apply_diff(self.text, self.shown, shown)
+        else:
+            self.text.delete("1.0", "end")
+            self.text.insert("1.0", shown)
+        self.text.config(state=tk.DISABLED)
+        self.top = top
+        self.shown = shown
+
+    def _outside(self, first_line, last_line):
+        # True when the view comes within half a margin of a window edge
+        # that is not also an end of the document
+        end = self.top + self.window
+        return ((self.top > 0 and first_line < self.top + self.margin // 2) or
+                (end < len(self.lines) and last_line > end - self.margin // 2))
+
+    def _on_scroll(self, first, last):
+        first_line = self.first_visible()
+        last_line = self.top + int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0]) - 1
+        if self._outside(first_line, last_line):
+            # The Text widget reports again once the window has moved
+            self._show(first_line - self.margin)
+            self.text.yview(f"{first_line - self.top + 1}.0")
+            return
+        total = len(self.lines)
+        count = min(self.window, total - self.top)
+        self.scrollbar.set((self.top + float(first) * count) / total, (self.top + float(last) * count) / total)
@@ -0,0 +1,357 @@
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+import instrument
+from batch import normalize_spec, output_name
+from sync import BuildManifest, write_if_changed
+from templates import TEMPLATES
+
+POLL_INTERVAL = 0.5
+# Edits are collected until none has arrived for DEBOUNCE seconds, but a
+# steady stream of edits still rebuilds every MAX_DELAY seconds
+DEBOUNCE = 0.2
+MAX_DELAY = 2.0
+# Polling stats this many files per tick round-robin, plus every file that
+# changed in the last HOT_SECONDS. The directory listing is only re-read when
+# the directory's own mtime moves (files added, removed or replaced by
+# rename), and its inode numbers catch replaced files without a stat each.
+# An in-place edit to a quiet file is seen within len/STATS_PER_TICK ticks.
+STATS_PER_TICK = 2000
+HOT_SECONDS = 60
+SPEC_SUFFIXES = (".json", ".jsonl")
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class PollWatcher:
+    # wait() returns the names that changed, without statting every file each tick
+    def __init__(self, directory, accept, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.accept = accept
+        self.interval = interval
+        self.stats = {}
+        self.order = []
+        self.cursor = 0
+        self.hot = {}
+        self.dir_mtime = None
+        self._list()
+
+    def names(self):
+        return list(self.stats)
+
+    def _stat(self, name):
+        try:
+            st = os.stat(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _list(self):
+        # Changed names from a fresh directory listing: new files and removed ones
+        self.dir_mtime = os.stat(self.directory).st_mtime_ns
+        with os.scandir(self.directory) as entries:
+            current = {entry.name: entry.inode() for entry in entries if self.accept(entry.name)}
+        changed = set()
+        for name, inode in current.items():
+            known = self.stats.get(name)
+            if known is None or known[0] != inode:
+                self.stats[name] = self._stat(name)
+                self.hot[name] = time.monotonic()
+                changed.add(name)
+        for name in self.stats.keys() - current:
+            del self.stats[name]
+            self.hot.pop(name, None)
+            changed.add(name)
+        if changed:
+            self.order = sorted(self.stats)
+        return changed
+
+    def poll(self):
+        now = time.monotonic()
+        changed = set()
+        if os.stat(self.directory).st_mtime_ns != self.dir_mtime:
+            changed = self._list()
+        batch = self.order[self.cursor:self.cursor + STATS_PER_TICK]
+        self.cursor = self.cursor + STATS_PER_TICK if self.cursor + STATS_PER_TICK < len(self.order) else 0
+        for name in set(batch).union(self.hot):
+            if name not in self.stats:
+                continue
+            stat = self._stat(name)
+            if stat != self.stats[name]:
+                self.stats[name] = stat
+                self.hot[name] = now
+                changed.add(name)
+        for name, seen in list(self.hot.items()):
+            if now - seen > HOT_SECONDS:
+                del self.hot[name]
+        return changed
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        return self.poll()
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    # Linux only, through libc; wait() returns None when the kernel queue
+    # overflowed and events were lost, so the caller rescans
+    def __init__(self, directory, accept):
+        import ctypes
+        import ctypes.util
+        self.directory = directory
+        self.accept = accept
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def names(self):
+        with os.scandir(self.directory) as entries:
+            return [entry.name for entry in entries if self.accept(entry.name)]
+
+    def wait(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                if self.accept(name):
+                    changed.add(name)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_watcher(directory, accept, use_inotify=True, interval=POLL_INTERVAL):
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory, accept)
+        except (OSError, AttributeError):
+            pass
+    return PollWatcher(directory, accept, interval)
+
+
+class OutputNames:
+    # The output names one source file may use, for output_name(): names it
+    # already holds plus any no other source owns. Sources naming the same
+    # site get suffixed names instead of writing over each other's pages.
+    def __init__(self, owners, source):
+        self.owners = owners
+        self.source = source
+        self.used = set()
+
+    def __contains__(self, name):
+        # output_name() checks names before adding ".html"
+        return name in self.used or self.owners.get(name + ".html", self.source) != self.source
+
+    def add(self, name):
+        self.used.add(name)
+
+
+def split_specs(name, data, used=None):
+    # (output name, raw bytes, spec) per spec in a source file: one per line
+    # of a .jsonl file, else the whole file named after its own file name
+    if used is None:
+        used = set()
+    if name.endswith(".jsonl"):
+        entries = []
+        for line_no, line in enumerate(data.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                spec = _check_spec(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"line {line_no}: {e}")
+            entries.append((output_name(spec, used), line, spec))
+        return entries
+    spec = _check_spec(json.loads(data))
+    return [(output_name({"slug": os.path.splitext(name)[0]}, used), data, spec)]
+
+
+def _check_spec(spec):
+    # A spec is an object whose name and slug, when given, are strings
+    if not isinstance(spec, dict):
+        raise ValueError(f"expected an object, got {type(spec).__name__}")
+    for key in ("name", "slug"):
+        if key in spec and not isinstance(spec[key], str):
+            raise ValueError(f"'{key}' must be a string")
+    return spec
+
+
+class SpecWatcher:
+    # Rebuilds the pages of spec files as they change. path is one .json or
+    # .jsonl file, or a directory of them. Each source's content hash, and
+    # each spec's within it, decide what is re-rendered; touches and saves
+    # without changes render nothing.
+    def __init__(self, path, out_dir, use_inotify=True, interval=POLL_INTERVAL, debounce=DEBOUNCE, log=print):
+        if os.path.isdir(path):
+            self.directory = path
+            accept = lambda name: name.endswith(SPEC_SUFFIXES) and not name.startswith(".")
+        else:
+            # The parent is watched so editors that save by rename are seen
+            self.directory = os.path.dirname(path) or "."
+            target = os.path.basename(path)
+            accept = lambda name: name == target
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.debounce = debounce
+        self.log = log
+        self.watcher = open_watcher(self.directory, accept, use_inotify, interval)
+        self.manifest = BuildManifest(out_dir)
+        # Source name -> (file digest, {output name: spec digest}), and the
+        # source that owns each output name across the whole directory
+        self.sources = {}
+        self.owners = {}
+
+    @property
+    def mode(self):
+        return "inotify" if isinstance(self.watcher, InotifyWatcher) else "polling"
+
+    def build_all(self):
+        start = time.perf_counter()
+        # Sorted, so sources naming the same site get the same suffixes every run
+        stats = self.process(sorted(self.watcher.names()), quiet=True)
+        self.log(f"✓ Built {stats['rebuilt']} pages from {len(self.sources)} spec files in "
+                 f"{time.perf_counter() - start:.2f}s; watching {self.directory} ({self.mode})")
+        return stats
+
+    def run(self, stop=None):
+        # Until stop (a threading.Event) is set or Ctrl+C
+        pending = set()
+        first = last = None
+        try:
+            while stop is None or not stop.is_set():
+                changed = self.watcher.wait(self.debounce if pending else POLL_INTERVAL)
+                now = time.monotonic()
+                if changed is None:
+                    # Lost events: the content hashes sort out what really changed
+                    changed = set(self.watcher.names()) | self.sources.keys()
+                if changed:
+                    pending |= changed
+                    first = first or now
+                    last = now
+                if pending and (now - last >= self.debounce or now - first >= MAX_DELAY):
+                    self.process(sorted(pending))
+                    pending = set()
+                    first = last = None
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.watcher.close()
+            self.manifest.save()
+
+    def process(self, names, quiet=False):
+        stats = {"rebuilt": 0, "removed": 0, "errors": 0}
+        for name in names:
+            file_path = os.path.join(self.directory, name)
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                    edited = os.fstat(f.fileno()).st_mtime
+            except FileNotFoundError:
+                for output in self.sources.pop(name, (None, {}))[1]:
+                    if self._release(output, name):
+                        stats["removed"] += 1
+                        self._log(quiet, f"✓ {output} removed ({name} is gone)")
+                continue
+            digest = hashlib.sha1(data).digest()
+            known, outputs = self.sources.get(name, (None, {}))
+            if digest == known:
+                continue
+            try:
+                entries = split_specs(name, data, OutputNames(self.owners, name))
+            except ValueError as e:
+                # Often a save caught half way; the next save retries
+                stats["errors"] += 1
+                self._log(False, f"✗ {name}: invalid spec: {e}")
+                continue
+            current = {}
+            for output, raw, spec in entries:
+                spec_digest = hashlib.sha1(raw).digest()
+                current[output] = spec_digest
+                self.owners[output] = name
+                if outputs.get(output) == spec_digest and output in self.manifest.files:
+                    continue
+                if self._rebuild(output, spec, edited, quiet):
+                    stats["rebuilt"] += 1
+                else:
+                    stats["errors"] += 1
+                    current[output] = None
+            for output in outputs.keys() - current.keys():
+                if self._release(output, name):
+                    stats["removed"] += 1
+                    self._log(quiet, f"✓ {output} removed (no longer in {name})")
+            self.sources[name] = (digest, current)
+        if stats["rebuilt"] or stats["removed"]:
+            self.manifest.save()
+        return stats
+
+    def _release(self, output, source):
+        # Removes an output of source; one another source owns stays
+        if self.owners.get(output) != source:
+            return False
+        del self.owners[output]
+        self.manifest.remove(os.path.join(self.out_dir, output))
+        return True
+
+    def _rebuild(self, output, spec, edited, quiet):
+        template = spec.get("template", "Business") if isinstance(spec, dict) else None
+        if template not in TEMPLATES:
+            self._log(False, f"✗ {output}: unknown template '{template}'")
+            return False
+        file_path = os.path.join(self.out_dir, output)
+        timings = instrument.begin("watch")
+        start = time.perf_counter()
+        try:
+            with timings.stage("render"):
+                html_content = TEMPLATES[template](normalize_spec(spec))
+            with timings.stage("write"):
+                digest, size, written = write_if_changed(file_path, [html_content],
+                                                         self.manifest.previous(file_path))
+                timings.add_bytes(size if written else 0)
+        except Exception as e:
+            self._log(False, f"✗ {output}: {e}")
+            return False
+        timings.finish()
+        self.manifest.record(file_path, digest, size, written)
+        elapsed = time.perf_counter() - start
+        # Latency from the edit (the source's mtime) to the page being on disk
+        since_edit = max(0.0, time.time() - edited)
+        self._log(quiet, f"✓ {output} ({template}) rebuilt in {elapsed * 1e3:.1f} ms, "
+                         f"{since_edit * 1e3:.0f} ms after the edit" + ("" if written else " — unchanged"))
+        return True
+
+    def _log(self, quiet, message):
+        if not quiet:
+            self.log(time.strftime("%H:%M:%S ") + message)